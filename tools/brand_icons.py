@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Launcher Icon Brand Pack Generator
+
+Regenerates every platform launcher icon of a Flutter project from a single
+source image. The required sizes are read from the project itself (mipmap
+PNG headers, AppIcon Contents.json, web/manifest.json, the Windows .ico
+directory), resized across a process pool, and cached by
+(source hash, size, format) so re-running for an unchanged brand does no
+image work at all.
+
+Requires Pillow (pip install pillow).
+
+Usage: python brand_icons.py SOURCE_IMAGE [PROJECT_ROOT]
+"""
+
+import os
+import sys
+import json
+import struct
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rename_lock import STATE_DIR_NAME
+
+
+# Fallback launcher sizes when an existing icon cannot be inspected
+ANDROID_DENSITY_SIZES = {'mdpi': 48, 'hdpi': 72, 'xhdpi': 96, 'xxhdpi': 144, 'xxxhdpi': 192}
+WINDOWS_ICO_SIZES = (16, 32, 48, 256)
+
+
+def read_png_size(path: Path) -> Optional[int]:
+    """Read the width of a PNG from its IHDR chunk without decoding it."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(24)
+    except OSError:
+        return None
+    if len(header) < 24 or header[:8] != b'\x89PNG\r\n\x1a\n' or header[12:16] != b'IHDR':
+        return None
+    width, _height = struct.unpack('>II', header[16:24])
+    return width
+
+
+def read_ico_sizes(path: Path) -> Optional[Tuple[int, ...]]:
+    """Read the image sizes listed in an .ico directory."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < 6:
+        return None
+    reserved, image_type, count = struct.unpack('<HHH', data[:6])
+    if reserved != 0 or image_type != 1 or len(data) < 6 + count * 16:
+        return None
+    sizes = {data[6 + i * 16] or 256 for i in range(count)}
+    return tuple(sorted(sizes)) or None
+
+
+def _render_icon(source_path: str, size, image_format: str, output_path: str) -> str:
+    """Resize the source image into a single cache entry. Runs in a worker process."""
+    from PIL import Image
+
+    with Image.open(source_path) as source:
+        image = source.convert('RGBA')
+
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    if image_format == 'ico':
+        image.save(temp_path, format='ICO', sizes=[(s, s) for s in size])
+    else:
+        image = image.resize((size, size), Image.LANCZOS)
+        if image_format == 'png-opaque':
+            # App Store icons must not carry an alpha channel
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        image.save(temp_path, format='PNG', optimize=True)
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+class BrandIconGenerator:
+    def __init__(self, project_root: str = ".", cache_dir: Optional[str] = None, max_workers: Optional[int] = None):
+        self.project_root = Path(project_root).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / STATE_DIR_NAME / "icon_cache"
+        self.max_workers = max_workers
+        self.rendered_count = 0
+        self.cached_count = 0
+
+    def collect_targets(self) -> List[Dict]:
+        """Collect every launcher icon file with the size and format it needs."""
+        targets = {}
+
+        def add(path: Path, size, image_format: str):
+            targets.setdefault(path, {'path': path, 'size': size, 'format': image_format})
+
+        # Android mipmaps: keep each density's current size
+        res_dir = self.project_root / "android" / "app" / "src" / "main" / "res"
+        for icon_path in sorted(res_dir.glob("mipmap-*/ic_launcher.png")):
+            density = icon_path.parent.name.split('-', 1)[1]
+            size = read_png_size(icon_path) or ANDROID_DENSITY_SIZES.get(density)
+            if size:
+                add(icon_path, size, 'png')
+
+        # iOS and macOS asset catalogs are driven by Contents.json
+        for platform, image_format in (("ios", 'png-opaque'), ("macos", 'png')):
+            iconset_dir = self.project_root / platform / "Runner" / "Assets.xcassets" / "AppIcon.appiconset"
+            contents_path = iconset_dir / "Contents.json"
+            if not contents_path.exists():
+                continue
+            with open(contents_path, 'r', encoding='utf-8') as f:
+                images = json.load(f).get('images', [])
+            for image in images:
+                if not image.get('filename') or 'size' not in image:
+                    continue
+                points = float(image['size'].split('x')[0])
+                scale = float(image.get('scale', '1x').rstrip('x'))
+                add(iconset_dir / image['filename'], int(round(points * scale)), image_format)
+
+        # Web icons are listed in manifest.json
+        web_dir = self.project_root / "web"
+        manifest_path = web_dir / "manifest.json"
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                icons = json.load(f).get('icons', [])
+            for icon in icons:
+                if icon.get('src') and icon.get('sizes'):
+                    add(web_dir / icon['src'], int(icon['sizes'].split()[0].split('x')[0]), 'png')
+        favicon_path = web_dir / "favicon.png"
+        if favicon_path.exists():
+            add(favicon_path, read_png_size(favicon_path) or 16, 'png')
+
+        # Windows keeps all sizes in a single .ico
+        ico_path = self.project_root / "windows" / "runner" / "resources" / "app_icon.ico"
+        if ico_path.exists():
+            add(ico_path, read_ico_sizes(ico_path) or WINDOWS_ICO_SIZES, 'ico')
+
+        return list(targets.values())
+
+    def _cache_path(self, source_hash: str, size, image_format: str) -> Path:
+        size_key = '-'.join(str(s) for s in size) if isinstance(size, tuple) else str(size)
+        extension = 'ico' if image_format == 'ico' else 'png'
+        return self.cache_dir / f"{source_hash}_{size_key}_{image_format}.{extension}"
+
+    def generate(self, source_image: str) -> bool:
+        """Regenerate all launcher icons from source_image."""
+        source_path = Path(source_image).resolve()
+        if not source_path.exists():
+            print(f"✗ Source icon not found: {source_path}")
+            return False
+
+        try:
+            with open(source_path, 'rb') as f:
+                source_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+
+            targets = self.collect_targets()
+            if not targets:
+                print("Warning: no launcher icons found to update")
+                return True
+
+            # Render each distinct (size, format) once, and only if not cached
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            jobs = {}
+            for target in targets:
+                cache_path = self._cache_path(source_hash, target['size'], target['format'])
+                target['cache_path'] = cache_path
+                if not cache_path.exists():
+                    jobs[cache_path] = (target['size'], target['format'])
+
+            self.rendered_count = len(jobs)
+            self.cached_count = len(targets) - sum(1 for t in targets if t['cache_path'] in jobs)
+            if jobs:
+                try:
+                    from PIL import Image  # noqa: F401
+                except ImportError:
+                    print("✗ Pillow is required to render icons: pip install pillow")
+                    return False
+                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = [
+                        executor.submit(_render_icon, str(source_path), size, image_format, str(cache_path))
+                        for cache_path, (size, image_format) in jobs.items()
+                    ]
+                    for future in futures:
+                        future.result()
+
+            updated = 0
+            for target in targets:
+                with open(target['cache_path'], 'rb') as f:
+                    data = f.read()
+                path = target['path']
+                if path.exists():
+                    with open(path, 'rb') as f:
+                        if f.read() == data:
+                            continue
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(data)
+                updated += 1
+
+            print(f"✓ Updated launcher icons: {updated}/{len(targets)} changed "
+                  f"({self.rendered_count} rendered, {self.cached_count} from cache)")
+            return True
+
+        except Exception as e:
+            print(f"✗ Error generating launcher icons: {e}")
+            return False
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    generator = BrandIconGenerator(sys.argv[2] if len(sys.argv) > 2 else ".")
+    sys.exit(0 if generator.generate(sys.argv[1]) else 1)
+
+
+if __name__ == "__main__":
+    main()
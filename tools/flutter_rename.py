@@ -5,92 +5,285 @@ Flutter App Renaming Tool
 A comprehensive script to rename Flutter applications across all platform configurations.
 Handles package names, display names, class names, and bundle identifiers consistently.
 
-Usage: python flutter_rename.py
+Usage:
+    python flutter_rename.py                            # interactive rename
+    python flutter_rename.py --icon brand.png           # interactive rename with new launcher icons
+    python flutter_rename.py --package-name NAME --app-name "Display Name" --yes --no-refresh
+    python flutter_rename.py validate-manifest FILE     # bulk-validate variant specs
+    python flutter_rename.py icons brand.png            # only regenerate launcher icons
+    python flutter_rename.py scan OLD_NAME ...          # find stale identifiers after a rename
+    python flutter_rename.py history [--all-projects]   # timing statistics of past runs
 """
 
 import os
 import re
+import csv
 import json
+import time
+import hashlib
+import argparse
+import contextlib
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rename_lock import RenameConflictError, RenameLocks
+from rename_history import get_history
+from rename_state import RenameState
+
+DART_RESERVED_WORDS = frozenset({
+    'abstract', 'as', 'assert', 'async', 'await', 'break', 'case', 'catch', 'class', 'const',
+    'continue', 'default', 'deferred', 'do', 'dynamic', 'else', 'enum', 'export', 'extends',
+    'external', 'factory', 'false', 'final', 'finally', 'for', 'function', 'get', 'hide', 'if',
+    'implements', 'import', 'in', 'interface', 'is', 'library', 'mixin', 'new', 'null', 'on',
+    'operator', 'part', 'rethrow', 'return', 'set', 'show', 'static', 'super', 'switch', 'sync',
+    'this', 'throw', 'true', 'try', 'typedef', 'var', 'void', 'while', 'with', 'yield',
+})
+
+PACKAGE_NAME_PATTERN = re.compile(r'^[a-z][a-z0-9_]*$')
+CLASS_NAME_STRIP_PATTERN = re.compile(r'[^a-zA-Z0-9\s]')
+
+MANIFEST_REQUIRED_COLUMNS = ('package_name', 'app_name')
+
+PUBSPEC_PATH = "pubspec.yaml"
+MAIN_DART_PATH = "lib/main.dart"
+ANDROID_MANIFEST_PATH = "android/app/src/main/AndroidManifest.xml"
+ANDROID_GRADLE_PATH = "android/app/build.gradle.kts"
+IOS_PLIST_PATH = "ios/Runner/Info.plist"
+
+
+class ManifestError(Exception):
+    """Raised when a variant manifest cannot be read or does not have the expected shape."""
 
 
 class FlutterRenamer:
     def __init__(self, project_root: str = "."):
         self.project_root = Path(project_root).resolve()
         self.current_config = {}
+        self.run_parameters: Dict[str, Optional[str]] = {}
+        # Content hash of each file as first read, keyed by project-relative path
+        self.file_hashes: Dict[str, str] = {}
+        # Size and mtime_ns of each file when that hash was taken
+        self.file_stats: Dict[str, Tuple[int, int]] = {}
+        # Content written during this run, keyed by project-relative path
+        self.written_content: Dict[str, str] = {}
+        # Snapshot of the last successful rename, and the files it vouched for
+        self.state = RenameState(str(self.project_root))
+        self.file_configs: Dict[str, Dict[str, str]] = {}
+        self.trusted_files = set()
+        self._reset_metrics()
+    
+    def _reset_metrics(self):
+        """Reset the per-run counters that are recorded in the run history."""
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.flutter_seconds = 0.0
+        self.step_timings: List[Dict] = []
+    
+    @contextlib.contextmanager
+    def _step(self, name: str):
+        """Time a rename step and the bytes it reads and writes."""
+        started = time.perf_counter()
+        bytes_read, bytes_written = self.bytes_read, self.bytes_written
+        try:
+            yield
+        finally:
+            self.step_timings.append({
+                'name': name,
+                'duration': time.perf_counter() - started,
+                'bytes_read': self.bytes_read - bytes_read,
+                'bytes_written': self.bytes_written - bytes_written,
+            })
+    
+    def _run_flutter(self, command: List[str], **kwargs):
+        """Run a Flutter subprocess, accounting its wall time."""
+        import subprocess
+        
+        started = time.perf_counter()
+        try:
+            return subprocess.run(command, **kwargs)
+        finally:
+            self.flutter_seconds += time.perf_counter() - started
+    
+    def _relative(self, path: Path) -> str:
+        """Return path relative to the project root, with forward slashes."""
+        return Path(path).resolve().relative_to(self.project_root).as_posix()
+    
+    def _read_text(self, path: Path) -> str:
+        """Read a project file, remembering the hash of its content as first seen."""
+        with open(path, 'rb') as f:
+            data = f.read()
+            stat = os.fstat(f.fileno())
+        self.bytes_read += len(data)
+        relative_path = self._relative(path)
+        if relative_path not in self.file_hashes:
+            self.file_hashes[relative_path] = hashlib.sha256(data).hexdigest()
+            self.file_stats[relative_path] = (stat.st_size, stat.st_mtime_ns)
+        return data.decode('utf-8')
+    
+    def _write_text(self, path: Path, content: str):
+        """Write a project file, refusing if it changed since it was first read."""
+        relative_path = self._relative(path)
+        expected = self.file_hashes.get(relative_path)
+        if expected is not None and path.exists():
+            with open(path, 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != expected:
+                    raise RenameConflictError(f"{relative_path} was modified by another process")
+        data = content.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            stat = os.fstat(f.fileno())
+        self.bytes_written += len(data)
+        self.file_hashes[relative_path] = hashlib.sha256(data).hexdigest()
+        self.file_stats[relative_path] = (stat.st_size, stat.st_mtime_ns)
+        self.written_content[relative_path] = content
+    
+    def verify_file_hashes(self):
+        """Check that no detected file changed since detection, before writing anything."""
+        for relative_path, expected in self.file_hashes.items():
+            path = self.project_root / relative_path
+            actual = None
+            if path.exists():
+                with open(path, 'rb') as f:
+                    actual = hashlib.sha256(f.read()).hexdigest()
+            if actual != expected:
+                raise RenameConflictError(f"{relative_path} was modified since it was detected")
+        
+    def _parse_pubspec(self, content: str) -> Dict[str, str]:
+        config = {}
+        if match := re.search(r'^name:\s*(.+)$', content, re.MULTILINE):
+            config['package_name'] = match.group(1).strip()
+        if match := re.search(r'^description:\s*["\']?([^"\']+)["\']?$', content, re.MULTILINE):
+            config['description'] = match.group(1).strip()
+        return config
+    
+    def _parse_main_dart(self, content: str) -> Dict[str, str]:
+        config = {}
+        if match := re.search(r'title:\s*["\']([^"\']+)["\']', content):
+            config['app_title'] = match.group(1)
+        if match := re.search(r'class\s+(\w+App)\s+extends', content):
+            config['main_class'] = match.group(1)
+        return config
+    
+    def _parse_android_manifest(self, content: str) -> Dict[str, str]:
+        config = {}
+        if match := re.search(r'android:label="([^"]*)"', content):
+            config['android_label'] = match.group(1)
+        return config
+    
+    def _parse_android_gradle(self, content: str) -> Dict[str, str]:
+        config = {}
+        if match := re.search(r'namespace\s*=\s*"([^"]*)"', content):
+            config['android_namespace'] = match.group(1)
+        if match := re.search(r'applicationId\s*=\s*"([^"]*)"', content):
+            config['android_application_id'] = match.group(1)
+        return config
+    
+    def _parse_ios_plist(self, content: str) -> Dict[str, str]:
+        config = {}
+        if match := re.search(r'<key>CFBundleDisplayName</key>\s*<string>([^<]+)</string>', content):
+            config['ios_display_name'] = match.group(1)
+        if match := re.search(r'<key>CFBundleName</key>\s*<string>([^<]+)</string>', content):
+            config['ios_bundle_name'] = match.group(1)
+        return config
+    
+    def _parse_template_arb(self, content: str) -> Dict[str, str]:
+        title = json.loads(content).get('appTitle')
+        return {'localized_title': title} if title else {}
+    
+    def _parse_generated_localizations(self, content: str) -> Dict[str, str]:
+        # The ARB can be rewritten while gen-l10n fails, so the getter is checked too
+        if match := re.search(r"String get appTitle =>\s*'((?:[^'\\]|\\.)*)';", content):
+            value = re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), match.group(1))
+            return {'generated_title': value}
+        return {}
+    
+    def config_sources(self) -> List[Tuple[str, Callable[[str], Dict[str, str]]]]:
+        """Project-relative configuration files and the parser for each, in display order."""
+        sources = [
+            (PUBSPEC_PATH, self._parse_pubspec),
+            (MAIN_DART_PATH, self._parse_main_dart),
+            (ANDROID_MANIFEST_PATH, self._parse_android_manifest),
+            (ANDROID_GRADLE_PATH, self._parse_android_gradle),
+            (IOS_PLIST_PATH, self._parse_ios_plist),
+        ]
+        l10n_config = self.read_l10n_config()
+        if l10n_config:
+            template_arb = (Path(l10n_config['arb-dir']) / l10n_config['template-arb-file']).as_posix()
+            sources.append((template_arb, self._parse_template_arb))
+            language = Path(l10n_config['template-arb-file']).stem.split('_', 1)[-1].split('_')[0]
+            base_file = Path(l10n_config['output-dir']) / l10n_config['output-localization-file']
+            sources.append((base_file.with_name(f"{base_file.stem}_{language}.dart").as_posix(),
+                            self._parse_generated_localizations))
+        return sources
+    
+    def detect_current_configuration(self, use_state: bool = True) -> Dict[str, str]:
+        """Detect current app configuration across all platform files.
         
-    def detect_current_configuration(self) -> Dict[str, str]:
-        """Detect current app configuration across all platform files."""
+        Files unchanged since the last successful rename are taken from the
+        state snapshot instead of being read and parsed again.
+        """
+        if use_state:
+            self.state.load()
         config = {}
+        self.file_configs = {}
+        self.trusted_files = set()
         
-        # Read pubspec.yaml
-        pubspec_path = self.project_root / "pubspec.yaml"
-        if pubspec_path.exists():
-            with open(pubspec_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if match := re.search(r'^name:\s*(.+)$', content, re.MULTILINE):
-                    config['package_name'] = match.group(1).strip()
-                if match := re.search(r'^description:\s*["\']?([^"\']+)["\']?$', content, re.MULTILINE):
-                    config['description'] = match.group(1).strip()
-        
-        # Read main.dart
-        main_dart_path = self.project_root / "lib" / "main.dart"
-        if main_dart_path.exists():
-            with open(main_dart_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if match := re.search(r'title:\s*["\']([^"\']+)["\']', content):
-                    config['app_title'] = match.group(1)
-                if match := re.search(r'class\s+(\w+App)\s+extends', content):
-                    config['main_class'] = match.group(1)
-        
-        # Read Android manifest
-        android_manifest_path = self.project_root / "android" / "app" / "src" / "main" / "AndroidManifest.xml"
-        if android_manifest_path.exists():
-            try:
-                with open(android_manifest_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if match := re.search(r'android:label="([^"]*)"', content):
-                        config['android_label'] = match.group(1)
-            except Exception:
-                pass
-        
-        # Read Android build.gradle.kts
-        android_gradle_path = self.project_root / "android" / "app" / "build.gradle.kts"
-        if android_gradle_path.exists():
-            try:
-                with open(android_gradle_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if match := re.search(r'namespace\s*=\s*"([^"]*)"', content):
-                        config['android_namespace'] = match.group(1)
-                    if match := re.search(r'applicationId\s*=\s*"([^"]*)"', content):
-                        config['android_application_id'] = match.group(1)
-            except Exception:
-                pass
-        
-        # Read iOS Info.plist
-        ios_plist_path = self.project_root / "ios" / "Runner" / "Info.plist"
-        if ios_plist_path.exists():
-            try:
-                with open(ios_plist_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if match := re.search(r'<key>CFBundleDisplayName</key>\s*<string>([^<]+)</string>', content):
-                        config['ios_display_name'] = match.group(1)
-                    if match := re.search(r'<key>CFBundleName</key>\s*<string>([^<]+)</string>', content):
-                        config['ios_bundle_name'] = match.group(1)
-            except Exception:
-                pass
+        for relative_path, parser in self.config_sources():
+            path = self.project_root / relative_path
+            if not path.exists():
+                continue
+            entry = self.state.lookup(relative_path) if use_state else None
+            if entry is not None:
+                file_config = dict(entry['config'])
+                if relative_path not in self.file_hashes:
+                    self.file_hashes[relative_path] = entry['sha256']
+                    self.file_stats[relative_path] = (entry['size'], entry['mtime_ns'])
+                self.trusted_files.add(relative_path)
+            else:
+                try:
+                    file_config = parser(self._read_text(path))
+                except Exception:
+                    file_config = {}
+            self.file_configs[relative_path] = file_config
+            config.update(file_config)
         
         self.current_config = config
         return config
     
+    def save_state(self, identifiers: Dict[str, str]):
+        """Snapshot the applied identifiers and the fingerprint of every configuration file.
+
+        Each fingerprint is the size and mtime seen when the file was read or
+        written in this run, so a later change by another job never inherits
+        this run's parsed values.
+        """
+        for relative_path, parser in self.config_sources():
+            if not (self.project_root / relative_path).exists():
+                self.state.files.pop(relative_path, None)
+                continue
+            content = self.written_content.get(relative_path)
+            if content is not None:
+                file_config = parser(content)
+            elif relative_path in self.file_configs:
+                file_config = self.file_configs[relative_path]
+            else:
+                file_config = parser(self._read_text(self.project_root / relative_path))
+            size, mtime_ns = self.file_stats[relative_path]
+            self.state.record(relative_path, self.file_hashes[relative_path], size, mtime_ns, file_config)
+        self.state.identifiers = dict(identifiers)
+        try:
+            self.state.save()
+        except OSError as e:
+            print(f"⚠ Warning: Could not save rename state: {e}")
+    
     def validate_package_name(self, package_name: str) -> Tuple[bool, str]:
         """Validate Flutter package name format."""
         if not package_name:
             return False, "Package name cannot be empty"
         
-        if not re.match(r'^[a-z][a-z0-9_]*$', package_name):
+        if not PACKAGE_NAME_PATTERN.match(package_name):
             return False, "Package name must start with lowercase letter and contain only lowercase letters, numbers, and underscores"
         
         if package_name.startswith('_') or package_name.endswith('_'):
@@ -99,8 +292,7 @@ class FlutterRenamer:
         if '__' in package_name:
             return False, "Package name cannot contain consecutive underscores"
         
-        reserved_words = {'abstract', 'as', 'assert', 'async', 'await', 'break', 'case', 'catch', 'class', 'const', 'continue', 'default', 'deferred', 'do', 'dynamic', 'else', 'enum', 'export', 'extends', 'external', 'factory', 'false', 'final', 'finally', 'for', 'function', 'get', 'hide', 'if', 'implements', 'import', 'in', 'interface', 'is', 'library', 'mixin', 'new', 'null', 'on', 'operator', 'part', 'rethrow', 'return', 'set', 'show', 'static', 'super', 'switch', 'sync', 'this', 'throw', 'true', 'try', 'typedef', 'var', 'void', 'while', 'with', 'yield'}
-        if package_name in reserved_words:
+        if package_name in DART_RESERVED_WORDS:
             return False, f"'{package_name}' is a reserved word and cannot be used as package name"
         
         return True, "Valid package name"
@@ -121,7 +313,7 @@ class FlutterRenamer:
     def generate_class_name(self, app_name: str) -> str:
         """Generate main class name from app display name."""
         # Remove special characters and convert to PascalCase
-        clean_name = re.sub(r'[^a-zA-Z0-9\s]', '', app_name)
+        clean_name = CLASS_NAME_STRIP_PATTERN.sub('', app_name)
         words = clean_name.split()
         class_name = ''.join(word.capitalize() for word in words if word)
         
@@ -145,7 +337,117 @@ class FlutterRenamer:
         
         # Default domain if no existing Android package found
         return f"com.example.{package_name}"
-    
+
+    def load_manifest(self, manifest_path: str) -> List[Dict[str, str]]:
+        """Load variant specs from a CSV or JSON manifest.
+
+        Raises ManifestError if the file cannot be read or parsed, or if it
+        lacks the package_name and app_name columns.
+        """
+        path = Path(manifest_path)
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                if path.suffix.lower() == '.json':
+                    data = json.load(f)
+                    if isinstance(data, dict):
+                        data = data.get('variants')
+                    if not isinstance(data, list):
+                        raise ManifestError(f"{path}: expected a list of variants or {{\"variants\": [...]}}")
+                    for index, row in enumerate(data):
+                        if not isinstance(row, dict):
+                            raise ManifestError(f"{path}: row {index + 1} is not an object")
+                        missing = [column for column in MANIFEST_REQUIRED_COLUMNS if column not in row]
+                        if missing:
+                            raise ManifestError(f"{path}: row {index + 1} is missing {', '.join(missing)}")
+                    return [dict(row) for row in data]
+
+                reader = csv.DictReader(f)
+                missing = [column for column in MANIFEST_REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+                if missing:
+                    raise ManifestError(f"{path}: missing column(s) {', '.join(missing)}")
+                return [dict(row) for row in reader]
+        except (OSError, UnicodeDecodeError, ValueError, csv.Error) as e:
+            raise ManifestError(f"Could not read manifest {path}: {e}")
+
+    def validate_manifest(self, rows: List[Dict[str, str]]) -> List[Dict]:
+        """Validate many variant specs in one pass, including cross-row collisions.
+
+        Each row needs 'package_name' and 'app_name'; 'android_package_id' is
+        optional and defaults to generate_android_package_id(package_name).
+        Returns one report entry per row, in input order.
+        """
+        report = []
+        seen = {
+            'package name': {},
+            'class name': {},
+            'Android package ID': {},
+        }
+
+        for index, row in enumerate(rows):
+            errors = []
+            values = {}
+            for column in ('package_name', 'app_name', 'android_package_id'):
+                value = row.get(column)
+                if value is not None and not isinstance(value, str):
+                    errors.append(f"{column} must be a string, got {type(value).__name__}")
+                    value = None
+                values[column] = (value or '').strip()
+            package_name, app_name = values['package_name'], values['app_name']
+            class_name = self.generate_class_name(app_name)
+            android_package_id = values['android_package_id'] or self.generate_android_package_id(package_name)
+
+            valid, message = self.validate_package_name(package_name)
+            if not valid:
+                errors.append(message)
+            valid, message = self.validate_app_name(app_name)
+            if not valid:
+                errors.append(message)
+
+            report.append({
+                'row': index + 1,
+                'package_name': package_name,
+                'app_name': app_name,
+                'class_name': class_name,
+                'android_package_id': android_package_id,
+                'errors': errors,
+            })
+
+            for label, value in (('package name', package_name),
+                                 ('class name', class_name if app_name else ''),
+                                 ('Android package ID', android_package_id if package_name else '')):
+                if value:
+                    seen[label].setdefault(value, []).append(index)
+
+        # Each row is appended to exactly one group per label, so this stays linear
+        for label, groups in seen.items():
+            for value, indices in groups.items():
+                if len(indices) < 2:
+                    continue
+                first_row = indices[0] + 1
+                for index in indices:
+                    report[index]['errors'].append(
+                        f"Duplicate {label} '{value}' (shared by {len(indices)} rows, first at row {first_row})"
+                    )
+
+        return report
+
+    def display_manifest_report(self, report: List[Dict]) -> bool:
+        """Print a manifest validation report. Returns True if every row is valid."""
+        invalid_rows = [entry for entry in report if entry['errors']]
+
+        print("\n" + "="*60)
+        print("MANIFEST VALIDATION")
+        print("="*60)
+        for entry in invalid_rows:
+            print(f"✗ Row {entry['row']}: {entry['package_name'] or '(empty)'} / {entry['app_name'] or '(empty)'}")
+            for error in entry['errors']:
+                print(f"    {error}")
+        print("-" * 40)
+        print(f"{len(report) - len(invalid_rows)}/{len(report)} rows valid")
+        print("="*60)
+
+        return not invalid_rows
+
     def update_pubspec_yaml(self, package_name: str, app_name: str) -> bool:
         """Update pubspec.yaml with new package name and description."""
         pubspec_path = self.project_root / "pubspec.yaml"
@@ -154,8 +456,7 @@ class FlutterRenamer:
             return False
         
         try:
-            with open(pubspec_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_text(pubspec_path)
             
             # Update package name
             content = re.sub(r'^name:\s*.*$', f'name: {package_name}', content, flags=re.MULTILINE)
@@ -164,12 +465,13 @@ class FlutterRenamer:
             description = f'"{app_name} - A Flutter application."'
             content = re.sub(r'^description:\s*.*$', f'description: {description}', content, flags=re.MULTILINE)
             
-            with open(pubspec_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_text(pubspec_path, content)
             
             print(f"✓ Updated pubspec.yaml")
             return True
             
+        except RenameConflictError:
+            raise
         except Exception as e:
             print(f"✗ Error updating pubspec.yaml: {e}")
             return False
@@ -182,8 +484,7 @@ class FlutterRenamer:
             return False
         
         try:
-            with open(main_dart_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_text(main_dart_path)
             
             # Update class name
             old_class_pattern = r'class\s+\w+App\s+extends'
@@ -200,12 +501,13 @@ class FlutterRenamer:
             # Update title
             content = re.sub(r'title:\s*["\'][^"\']*["\']', f"title: '{app_name}'", content)
             
-            with open(main_dart_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_text(main_dart_path, content)
             
             print(f"✓ Updated main.dart")
             return True
             
+        except RenameConflictError:
+            raise
         except Exception as e:
             print(f"✗ Error updating main.dart: {e}")
             return False
@@ -218,8 +520,7 @@ class FlutterRenamer:
             return False
         
         try:
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_text(manifest_path)
             
             # Update android:label
             content = re.sub(
@@ -228,12 +529,13 @@ class FlutterRenamer:
                 content
             )
             
-            with open(manifest_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_text(manifest_path, content)
             
             print(f"✓ Updated Android manifest")
             return True
             
+        except RenameConflictError:
+            raise
         except Exception as e:
             print(f"✗ Error updating Android manifest: {e}")
             return False
@@ -246,8 +548,7 @@ class FlutterRenamer:
             return False
         
         try:
-            with open(plist_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_text(plist_path)
             
             # Update CFBundleDisplayName
             content = re.sub(
@@ -263,16 +564,178 @@ class FlutterRenamer:
                 content
             )
             
-            with open(plist_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_text(plist_path, content)
             
             print(f"✓ Updated iOS Info.plist")
             return True
             
+        except RenameConflictError:
+            raise
         except Exception as e:
             print(f"✗ Error updating iOS Info.plist: {e}")
             return False
     
+    def read_l10n_config(self) -> Optional[Dict[str, str]]:
+        """Read l10n.yaml, filling in the gen-l10n defaults. Returns None if absent."""
+        l10n_path = self.project_root / "l10n.yaml"
+        if not l10n_path.exists():
+            return None
+
+        config = {
+            'arb-dir': 'lib/l10n',
+            'template-arb-file': 'app_en.arb',
+            'output-localization-file': 'app_localizations.dart',
+            'output-class': 'AppLocalizations',
+        }
+        with open(l10n_path, 'r', encoding='utf-8') as f:
+            for match in re.finditer(r'^([\w-]+):\s*["\']?([^"\'#\n]*?)["\']?\s*(?:#.*)?$', f.read(), re.MULTILINE):
+                config[match.group(1)] = match.group(2)
+        config.setdefault('output-dir', config['arb-dir'])
+        return config
+
+    @staticmethod
+    def _dart_string_literal(value: str) -> str:
+        """Quote a string the way gen-l10n writes single-quoted Dart literals."""
+        escaped = value.replace('\\', '\\\\').replace("'", "\\'").replace('$', '\\$').replace('\n', '\\n')
+        return f"'{escaped}'"
+
+    def _patch_generated_localizations(self, l10n_config: Dict[str, str], arb_locales: Dict[str, str],
+                                       template_title: Optional[str]) -> Tuple[bool, str]:
+        """Patch appTitle in the generated Dart files in place.
+
+        Returns (False, reason) if the generated files are missing or do not
+        have the expected shape, in which case a full regeneration is needed.
+        """
+        output_dir = self.project_root / l10n_config['output-dir']
+        base_file = output_dir / l10n_config['output-localization-file']
+        output_class = l10n_config['output-class']
+        literal_pattern = r"'(?:[^'\\]|\\.)*'"
+
+        patched = {}
+        for locale, title in arb_locales.items():
+            language = locale.split('_')[0]
+            locale_file = base_file.with_name(f"{base_file.stem}_{language}.dart")
+            if not locale_file.exists():
+                return False, f"Generated localization file {locale_file.name} not found"
+            content = patched.get(locale_file)
+            if content is None:
+                content = self._read_text(locale_file)
+
+            class_name = output_class + ''.join(part.capitalize() for part in re.split(r'[_-]', locale))
+            class_match = re.search(rf'^class\s+{class_name}\s+extends', content, re.MULTILINE)
+            if not class_match:
+                return False, f"Generated class {class_name} not found in {locale_file.name}"
+            getter_pattern = re.compile(rf'(String get appTitle =>\s*){literal_pattern};')
+            getter_match = getter_pattern.search(content, class_match.end())
+            if not getter_match:
+                return False, f"appTitle getter of {class_name} has an unexpected shape"
+            content = (content[:getter_match.start()]
+                       + f"{getter_match.group(1)}{self._dart_string_literal(title)};"
+                       + content[getter_match.end():])
+            patched[locale_file] = content
+
+        # The template value is also echoed in the abstract class's doc comment
+        if template_title is not None and base_file.exists():
+            content = self._read_text(base_file)
+            content = re.sub(
+                rf'(@appTitle\.\n(?:\s*///.*\n)*?\s*/// \*\*){literal_pattern}(\*\*)',
+                lambda m: f"{m.group(1)}{self._dart_string_literal(template_title)}{m.group(2)}",
+                content
+            )
+            patched[base_file] = content
+
+        for path, content in patched.items():
+            self._write_text(path, content)
+        return True, ""
+
+    def _generated_localization_keys(self, l10n_config: Dict[str, str]) -> Optional[set]:
+        """Return the message names declared by the generated abstract localizations class."""
+        base_file = self.project_root / l10n_config['output-dir'] / l10n_config['output-localization-file']
+        if not base_file.exists():
+            return None
+        content = self._read_text(base_file)
+        return set(re.findall(r'^  String (?:get )?(\w+)\s*[;(]', content, re.MULTILINE))
+
+    def regenerate_localizations(self) -> bool:
+        """Run 'flutter gen-l10n' to fully regenerate the localization classes."""
+        flutter_cmd = self.find_flutter_executable()
+        if not flutter_cmd:
+            print("✗ Flutter executable not found, run 'flutter gen-l10n' manually")
+            return False
+
+        print("Running 'flutter gen-l10n'...")
+        result = self._run_flutter(
+            [flutter_cmd, "gen-l10n"],
+            cwd=self.project_root,
+            capture_output=True,
+            text=True,
+            timeout=120
+        )
+        if result.returncode != 0:
+            print(f"✗ flutter gen-l10n failed: {result.stderr.strip()}")
+            return False
+        print("✓ flutter gen-l10n completed")
+        return True
+
+    def update_localizations(self, app_name: str) -> bool:
+        """Update appTitle in every ARB file and the generated localization classes."""
+        l10n_config = self.read_l10n_config()
+        if l10n_config is None:
+            return True  # Project is not localized, nothing to update
+
+        arb_dir = self.project_root / l10n_config['arb-dir']
+        arb_files = sorted(arb_dir.glob("*.arb"))
+        if not arb_files:
+            print(f"Warning: no ARB files found in {arb_dir}")
+            return False
+
+        try:
+            arb_locales = {}
+            template_title = None
+            template_keys = set()
+            for arb_file in arb_files:
+                content = self._read_text(arb_file)
+                data = json.loads(content)
+                locale = data.get('@@locale') or arb_file.stem.split('_', 1)[-1]
+                if arb_file.name == l10n_config['template-arb-file']:
+                    template_keys = {key for key in data if not key.startswith('@')}
+                if 'appTitle' not in data:
+                    continue
+
+                content = re.sub(
+                    r'("appTitle"\s*:\s*)"(?:[^"\\]|\\.)*"',
+                    lambda m: m.group(1) + json.dumps(app_name, ensure_ascii=False),
+                    content,
+                    count=1
+                )
+                self._write_text(arb_file, content)
+
+                arb_locales[locale] = app_name
+                if arb_file.name == l10n_config['template-arb-file']:
+                    template_title = app_name
+
+            print(f"✓ Updated appTitle in {len(arb_locales)} ARB file(s)")
+
+            # Patching only works while the generated classes match the ARB key set
+            generated_keys = self._generated_localization_keys(l10n_config)
+            if generated_keys is None:
+                print("Generated localizations not found, regenerating...")
+            elif generated_keys != template_keys:
+                print("ARB keys differ from generated localizations, regenerating...")
+            else:
+                patched, reason = self._patch_generated_localizations(l10n_config, arb_locales, template_title)
+                if patched:
+                    print("✓ Patched generated localizations")
+                    return True
+                print(f"{reason}, regenerating...")
+            return self.regenerate_localizations()
+
+        except RenameConflictError:
+            raise
+        except Exception as e:
+            print(f"✗ Error updating localizations: {e}")
+            return False
+
     def update_android_gradle(self, android_package_id: str) -> bool:
         """Update Android build.gradle.kts with new namespace and applicationId."""
         gradle_path = self.project_root / "android" / "app" / "build.gradle.kts"
@@ -281,8 +744,7 @@ class FlutterRenamer:
             return False
         
         try:
-            with open(gradle_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_text(gradle_path)
             
             # Update namespace
             content = re.sub(
@@ -298,12 +760,13 @@ class FlutterRenamer:
                 content
             )
             
-            with open(gradle_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_text(gradle_path, content)
             
             print(f"✓ Updated Android build.gradle.kts")
             return True
             
+        except RenameConflictError:
+            raise
         except Exception as e:
             print(f"✗ Error updating Android build.gradle.kts: {e}")
             return False
@@ -335,8 +798,7 @@ class FlutterRenamer:
             mainactivity_file = old_package_dir / "MainActivity.kt"
             if mainactivity_file.exists():
                 # Read and update MainActivity.kt
-                with open(mainactivity_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_text(mainactivity_file)
                 
                 # Update package declaration
                 content = re.sub(
@@ -349,8 +811,7 @@ class FlutterRenamer:
                 # Write to new location
                 new_mainactivity_file = new_package_dir / "MainActivity.kt"
                 new_package_dir.mkdir(parents=True, exist_ok=True)
-                with open(new_mainactivity_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                self._write_text(new_mainactivity_file, content)
                 
                 # Remove old file
                 mainactivity_file.unlink()
@@ -373,12 +834,25 @@ class FlutterRenamer:
             
             return True
             
+        except RenameConflictError:
+            raise
         except Exception as e:
             print(f"✗ Error updating Android package structure: {e}")
             return False
     
-    def update_test_files(self, old_package_name: str, new_package_name: str, old_class_name: str, new_class_name: str) -> bool:
-        """Update test files with new package imports and class names."""
+    def update_test_files(self, old_package_name: str, new_package_name: str, old_class_name: str, new_class_name: str,
+                          previous_identifiers: Optional[Dict[str, str]] = None) -> bool:
+        """Update test files with new package imports and class names.
+
+        Test files have no fingerprint in the rename snapshot, so the package
+        and class name of previous_identifiers (the last applied rename) are
+        replaced too, in case the configuration files were edited since.
+        """
+        previous_identifiers = previous_identifiers or {}
+        old_package_names = [name for name in dict.fromkeys(
+            (old_package_name, previous_identifiers.get('package_name'))) if name and name != new_package_name]
+        old_class_names = [name for name in dict.fromkeys(
+            (old_class_name, previous_identifiers.get('class_name'))) if name and name != new_class_name]
         test_dir = self.project_root / "test"
         if not test_dir.exists():
             return True  # No test directory, nothing to update
@@ -392,33 +866,33 @@ class FlutterRenamer:
             updated_files = []
             for test_file in test_files:
                 try:
-                    with open(test_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
+                    content = self._read_text(test_file)
                     
                     original_content = content
                     
                     # Update package imports
-                    if old_package_name and new_package_name:
+                    for old_name in old_package_names if new_package_name else []:
                         content = re.sub(
-                            rf"import\s+['\"]package:{re.escape(old_package_name)}/",
+                            rf"import\s+['\"]package:{re.escape(old_name)}/",
                             f"import 'package:{new_package_name}/",
                             content
                         )
                     
                     # Update class references
-                    if old_class_name and new_class_name and old_class_name != new_class_name:
+                    for old_name in old_class_names if new_class_name else []:
                         content = re.sub(
-                            rf"\b{re.escape(old_class_name)}\b",
+                            rf"\b{re.escape(old_name)}\b",
                             new_class_name,
                             content
                         )
                     
                     # Write back if changed
                     if content != original_content:
-                        with open(test_file, 'w', encoding='utf-8') as f:
-                            f.write(content)
+                        self._write_text(test_file, content)
                         updated_files.append(test_file.name)
                         
+                except RenameConflictError:
+                    raise
                 except Exception as e:
                     print(f"⚠ Warning: Could not update test file {test_file}: {e}")
             
@@ -429,10 +903,46 @@ class FlutterRenamer:
             
             return True
             
+        except RenameConflictError:
+            raise
         except Exception as e:
             print(f"✗ Error updating test files: {e}")
             return False
     
+    def update_launcher_icons(self, icon_source: str) -> bool:
+        """Regenerate launcher icons for all platforms from a single source image."""
+        from brand_icons import BrandIconGenerator
+        
+        return BrandIconGenerator(str(self.project_root)).generate(icon_source)
+    
+    def verify_no_stale_identifiers(self, old_values: Dict[str, str], new_values: Dict[str, str]) -> bool:
+        """Report remaining occurrences of old identifiers anywhere in the project."""
+        from stale_scan import scan_project
+        
+        identifiers = [old for key, old in old_values.items() if old and old != new_values.get(key)]
+        if not identifiers:
+            return True
+        
+        # New identifiers that merely contain an old one are not stale
+        ignore = {old: [new for new in new_values.values() if new and old in new] for old in identifiers}
+        
+        print("\nVerifying no stale identifiers remain...")
+        print("-" * 40)
+        try:
+            results = scan_project(str(self.project_root), identifiers, ignore)
+        except Exception as e:
+            print(f"✗ Error scanning for stale identifiers: {e}")
+            return False
+        
+        if not results:
+            print("✓ No occurrences of old identifiers found")
+            return True
+        
+        print(f"⚠ Found {len(results)} remaining occurrence(s) of old identifiers:")
+        for identifier, relative_path, line_number, line in results:
+            print(f"  {relative_path}:{line_number}: [{identifier}] {line}")
+        return False
+    
     def find_flutter_executable(self) -> str:
         """Find Flutter executable, handling Windows PATH issues."""
         import subprocess
@@ -440,7 +950,7 @@ class FlutterRenamer:
         
         # First try the simple approach
         try:
-            result = subprocess.run(
+            result = self._run_flutter(
                 ["flutter", "--version"],
                 capture_output=True,
                 text=True,
@@ -507,7 +1017,7 @@ class FlutterRenamer:
         try:
             # Run flutter clean
             print("Running 'flutter clean'...")
-            result = subprocess.run(
+            result = self._run_flutter(
                 [flutter_cmd, "clean"],
                 cwd=self.project_root,
                 capture_output=True,
@@ -522,7 +1032,7 @@ class FlutterRenamer:
             
             # Run flutter pub get
             print("Running 'flutter pub get'...")
-            result = subprocess.run(
+            result = self._run_flutter(
                 [flutter_cmd, "pub", "get"],
                 cwd=self.project_root,
                 capture_output=True,
@@ -629,6 +1139,7 @@ class FlutterRenamer:
             "android/app/build.gradle.kts",
             "android/app/src/main/kotlin/.../MainActivity.kt",
             "ios/Runner/Info.plist",
+            "lib/**/*.arb and generated localizations (if present)",
             "test/**/*.dart (if present)"
         ]
         for file_path in files_to_update:
@@ -640,17 +1151,150 @@ class FlutterRenamer:
         confirm = input("Proceed with renaming? (y/N): ").strip().lower()
         return confirm in ('y', 'yes')
     
-    def run_rename(self) -> bool:
-        """Execute the complete rename process."""
+    def planned_files(self, android_package_id: str, icon_source: Optional[str] = None) -> List[str]:
+        """List the project-relative paths a rename will modify, for locking."""
+        paths = [
+            "pubspec.yaml",
+            "lib/main.dart",
+            "android/app/src/main/AndroidManifest.xml",
+            "android/app/build.gradle.kts",
+            "ios/Runner/Info.plist",
+        ]
+        
+        kotlin_dir = Path("android") / "app" / "src" / "main" / "kotlin"
+        for package_id in (self.current_config.get('android_namespace', ''), android_package_id):
+            if package_id:
+                paths.append((kotlin_dir / Path(*package_id.split('.')) / "MainActivity.kt").as_posix())
+        
+        test_dir = self.project_root / "test"
+        if test_dir.exists():
+            paths.extend(self._relative(path) for path in test_dir.rglob("*.dart"))
+        
+        l10n_config = self.read_l10n_config()
+        if l10n_config:
+            paths.extend(self._relative(path) for path in (self.project_root / l10n_config['arb-dir']).glob("*.arb"))
+            output_dir = self.project_root / l10n_config['output-dir']
+            output_stem = Path(l10n_config['output-localization-file']).stem
+            paths.extend(self._relative(path) for path in output_dir.glob(f"{output_stem}*.dart"))
+        
+        if icon_source:
+            from brand_icons import BrandIconGenerator
+            
+            generator = BrandIconGenerator(str(self.project_root))
+            paths.extend(self._relative(target['path']) for target in generator.collect_targets())
+        
+        return sorted(set(paths))
+    
+    def plan_updates(self, package_name: str, app_name: str, class_name: str, android_package_id: str,
+                     icon_source: Optional[str] = None) -> List[str]:
+        """Return the rename steps whose files do not already hold the new values."""
+        config = self.current_config
+        needed = {
+            'pubspec': (config.get('package_name') != package_name or
+                        config.get('description') != f"{app_name} - A Flutter application."),
+            'main_dart': config.get('app_title') != app_name or config.get('main_class') != class_name,
+            'android_manifest': config.get('android_label') != app_name,
+            'android_gradle': (config.get('android_namespace') != android_package_id or
+                               config.get('android_application_id') != android_package_id),
+            'android_package': config.get('android_namespace') != android_package_id,
+            'ios_plist': config.get('ios_display_name') != app_name or config.get('ios_bundle_name') != package_name,
+            'localizations': (config.get('localized_title', app_name) != app_name or
+                              config.get('generated_title', app_name) != app_name),
+            # Test files are not fingerprinted, so they may still hold the last applied names
+            'test_files': (config.get('package_name') != package_name or config.get('main_class') != class_name or
+                           self.state.identifiers.get('package_name', package_name) != package_name or
+                           self.state.identifiers.get('class_name', class_name) != class_name),
+            'launcher_icons': bool(icon_source),
+        }
+        return [name for name, required in needed.items() if required]
+    
+    def apply_updates(self, package_name: str, app_name: str, class_name: str, android_package_id: str,
+                      icon_source: Optional[str] = None, only: Optional[List[str]] = None) -> Tuple[int, int]:
+        """Apply the rename steps (all, or those named in only). Returns (successful steps, total steps)."""
+        old_package_name = self.current_config.get('package_name', '')
+        old_class_name = self.current_config.get('main_class', '')
+        old_android_package = self.current_config.get('android_namespace', '')
+        
+        steps = [
+            ('pubspec', lambda: self.update_pubspec_yaml(package_name, app_name)),
+            ('main_dart', lambda: self.update_main_dart(package_name, app_name, class_name)),
+            ('android_manifest', lambda: self.update_android_manifest(app_name)),
+            ('android_gradle', lambda: self.update_android_gradle(android_package_id)),
+            # Update Android package structure if namespace changed
+            ('android_package', lambda: self.update_android_package_structure(old_android_package, android_package_id)),
+            ('ios_plist', lambda: self.update_ios_info_plist(package_name, app_name)),
+            ('localizations', lambda: self.update_localizations(app_name)),
+            ('test_files', lambda: self.update_test_files(old_package_name, package_name, old_class_name, class_name,
+                                                          self.state.identifiers)),
+        ]
+        if icon_source:
+            steps.append(('launcher_icons', lambda: self.update_launcher_icons(icon_source)))
+        if only is not None:
+            steps = [(name, update) for name, update in steps if name in only]
+        
+        success_count = 0
+        for name, update in steps:
+            with self._step(name):
+                if update():
+                    success_count += 1
+        
+        return success_count, len(steps)
+    
+    def record_run(self, started_at: float, duration: float, success: bool):
+        """Queue a record of this run for the run history database."""
+        get_history().add({
+            'started_at': started_at,
+            'project': str(self.project_root),
+            'parameters': self.run_parameters,
+            'success': success,
+            'duration': duration,
+            'flutter_seconds': self.flutter_seconds,
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'steps': self.step_timings,
+        })
+    
+    def run_rename(self, icon_source: Optional[str] = None, package_name: Optional[str] = None,
+                   app_name: Optional[str] = None, assume_yes: bool = False,
+                   refresh: Optional[bool] = None, stale_scan: bool = True) -> bool:
+        """Execute the complete rename process and record it in the run history.
+        
+        If package_name and app_name are given the rename runs without
+        prompting for them; assume_yes skips the confirmation, refresh
+        answers the Flutter refresh question and stale_scan=False skips the
+        post-rename scan for old identifiers.
+        """
+        self._reset_metrics()
+        self.written_content = {}
+        self.run_parameters = {'package_name': package_name, 'app_name': app_name, 'icon_source': icon_source}
+        started_at = time.time()
+        started = time.perf_counter()
+        success = False
+        try:
+            success = self._run_rename(icon_source, package_name, app_name, assume_yes, refresh, stale_scan)
+            return success
+        finally:
+            self.record_run(started_at, time.perf_counter() - started, success)
+    
+    def _run_rename(self, icon_source: Optional[str], package_name: Optional[str], app_name: Optional[str],
+                    assume_yes: bool, refresh: Optional[bool], stale_scan: bool = True) -> bool:
         print("Flutter App Renaming Tool")
         print("="*60)
         
         # Detect current configuration
-        self.detect_current_configuration()
+        with self._step('detect'):
+            self.detect_current_configuration()
         self.display_current_config()
         
         # Get user input
-        user_input = self.get_user_input()
+        if package_name and app_name:
+            for valid, message in (self.validate_package_name(package_name), self.validate_app_name(app_name)):
+                if not valid:
+                    print(f"✗ {message}")
+                    return False
+            user_input = (package_name, app_name)
+        else:
+            user_input = self.get_user_input()
         if not user_input:
             print("Rename cancelled.")
             return False
@@ -658,71 +1302,80 @@ class FlutterRenamer:
         package_name, app_name = user_input
         class_name = self.generate_class_name(app_name)
         android_package_id = self.generate_android_package_id(package_name)
+        identifiers = {
+            'package_name': package_name,
+            'app_name': app_name,
+            'class_name': class_name,
+            'android_package_id': android_package_id,
+        }
+        self.run_parameters.update(identifiers)
         
-        # Check if anything actually changed
-        no_changes = (
-            package_name == self.current_config.get('package_name', '') and
-            app_name == self.current_config.get('app_title', '') and
-            class_name == self.current_config.get('main_class', '') and
-            android_package_id == self.current_config.get('android_namespace', '')
-        )
-        
-        if no_changes:
+        # Only the steps whose files differ from the new values need to run
+        plan = self.plan_updates(package_name, app_name, class_name, android_package_id, icon_source)
+        if not plan:
+            self.save_state(identifiers)
             print("\n" + "="*60)
             print("No changes detected - configuration is already up to date.")
             print("="*60)
             return True
         
         # Confirm changes
-        if not self.confirm_changes(package_name, app_name, class_name, android_package_id):
+        if not assume_yes and not self.confirm_changes(package_name, app_name, class_name, android_package_id):
             print("Rename cancelled.")
             return False
         
         print("\nApplying changes...")
         print("-" * 40)
         
-        # Apply all updates
-        success_count = 0
-        total_updates = 7
-        
-        if self.update_pubspec_yaml(package_name, app_name):
-            success_count += 1
-        
-        if self.update_main_dart(package_name, app_name, class_name):
-            success_count += 1
-            
-        if self.update_android_manifest(app_name):
-            success_count += 1
-            
-        if self.update_android_gradle(android_package_id):
-            success_count += 1
-        
-        # Update Android package structure if namespace changed
-        old_android_package = self.current_config.get('android_namespace', '')
-        if self.update_android_package_structure(old_android_package, android_package_id):
-            success_count += 1
-            
-        if self.update_ios_info_plist(package_name, app_name):
-            success_count += 1
-        
-        # Update test files
-        old_package_name = self.current_config.get('package_name', '')
-        old_class_name = self.current_config.get('main_class', '')
-        if self.update_test_files(old_package_name, package_name, old_class_name, class_name):
-            success_count += 1
+        # Lock every target file, then make sure nothing changed since detection
+        try:
+            with RenameLocks(str(self.project_root), self.planned_files(android_package_id, icon_source)):
+                self.verify_file_hashes()
+                success_count, total_updates = self.apply_updates(
+                    package_name, app_name, class_name, android_package_id, icon_source, only=plan
+                )
+                # Snapshot before releasing the locks, so no other job can write in between
+                if success_count == total_updates:
+                    self.save_state(identifiers)
+        except RenameConflictError as e:
+            print(f"✗ Rename aborted: {e}")
+            return False
         
         print("-" * 40)
         print(f"Rename completed: {success_count}/{total_updates} files updated successfully")
         
+        if stale_scan:
+            with self._step('stale_scan'):
+                self.verify_no_stale_identifiers(
+                    {
+                        'package_name': self.current_config.get('package_name', ''),
+                        'main_class': self.current_config.get('main_class', ''),
+                        'android_namespace': self.current_config.get('android_namespace', ''),
+                    },
+                    {
+                        'package_name': package_name,
+                        'main_class': class_name,
+                        'android_namespace': android_package_id,
+                    }
+                )
+        
         if success_count == total_updates:
             print("\n✓ All files updated successfully!")
             
             # Ask about automatic Flutter refresh
-            auto_refresh = input("\nRun automatic Flutter refresh (flutter clean && flutter pub get)? (Y/n): ").strip().lower()
-            should_refresh = auto_refresh not in ('n', 'no')
+            if refresh is None:
+                auto_refresh = input("\nRun automatic Flutter refresh (flutter clean && flutter pub get)? (Y/n): ").strip().lower()
+                refresh = auto_refresh not in ('n', 'no')
             
-            # Automatically run Flutter commands to refresh the project
-            flutter_success = self.run_flutter_commands(should_refresh)
+            # Automatically run Flutter commands to refresh the project; these
+            # touch the whole project, so wait for other jobs' file locks first
+            try:
+                with self._step('flutter_refresh'), \
+                        RenameLocks(str(self.project_root), exclusive_project=True, project_timeout=600):
+                    flutter_success = self.run_flutter_commands(refresh)
+            except RenameConflictError as e:
+                print(f"✗ {e}")
+                flutter_success = False
             
             print("\n" + "="*60)
             if flutter_success:
@@ -741,15 +1394,93 @@ class FlutterRenamer:
             return False
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Rename a Flutter application across all platforms.")
+    parser.add_argument('--project-root', default='.', help="Flutter project root (default: current directory)")
+    parser.add_argument('--icon', help="Source image to regenerate launcher icons from during the rename")
+    parser.add_argument('--package-name', help="New package name (skips the prompt; requires --app-name)")
+    parser.add_argument('--app-name', help="New app display name (skips the prompt; requires --package-name)")
+    parser.add_argument('--yes', action='store_true', help="Apply changes without asking for confirmation")
+    parser.add_argument('--refresh', dest='refresh', action='store_true', default=None,
+                        help="Run 'flutter clean' and 'flutter pub get' afterwards without asking")
+    parser.add_argument('--no-refresh', dest='refresh', action='store_false',
+                        help="Skip the Flutter refresh without asking")
+    parser.add_argument('--no-stale-scan', dest='stale_scan', action='store_false',
+                        help="Skip the post-rename scan for old identifiers")
+    subparsers = parser.add_subparsers(dest='command')
+
+    icons_parser = subparsers.add_parser('icons', help="Only regenerate launcher icons from a source image")
+    icons_parser.add_argument('source', help="Source image, ideally 1024x1024 or larger")
+
+    history_parser = subparsers.add_parser('history', help="Report timing statistics of past rename runs")
+    history_parser.add_argument('--all-projects', action='store_true', help="Include runs of every project")
+    history_parser.add_argument('--days', type=int, help="Only include runs from the last N days")
+    history_parser.add_argument('--slowest', type=int, default=5, help="Number of slowest stages to list")
+
+    scan_parser = subparsers.add_parser('scan', help="Report remaining occurrences of old identifiers")
+    scan_parser.add_argument('identifiers', nargs='+', help="Old package, class or Android namespace names")
+
+    validate_parser = subparsers.add_parser('validate-manifest', help="Validate a CSV/JSON manifest of variant specs")
+    validate_parser.add_argument('manifest', help="Manifest file with package_name and app_name columns")
+    validate_parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+
+    args = parser.parse_args(argv)
+    if bool(args.package_name) != bool(args.app_name):
+        parser.error("--package-name and --app-name must be given together")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point."""
+    args = parse_args(argv)
     try:
-        renamer = FlutterRenamer()
-        renamer.run_rename()
+        renamer = FlutterRenamer(args.project_root)
+        if args.command == 'validate-manifest':
+            renamer.detect_current_configuration()
+            try:
+                report = renamer.validate_manifest(renamer.load_manifest(args.manifest))
+            except ManifestError as e:
+                print(f"✗ {e}")
+                raise SystemExit(1)
+            if args.json:
+                print(json.dumps(report, indent=2, ensure_ascii=False))
+                valid = all(not entry['errors'] for entry in report)
+            else:
+                valid = renamer.display_manifest_report(report)
+            raise SystemExit(0 if valid else 1)
+        if args.command == 'history':
+            get_history().display_report(
+                project=None if args.all_projects else str(renamer.project_root),
+                days=args.days,
+                slowest=args.slowest
+            )
+            return
+        if args.command == 'scan':
+            clean = renamer.verify_no_stale_identifiers(
+                {identifier: identifier for identifier in args.identifiers}, {}
+            )
+            raise SystemExit(0 if clean else 1)
+        if args.command == 'icons':
+            raise SystemExit(0 if renamer.update_launcher_icons(args.source) else 1)
+        success = renamer.run_rename(
+            icon_source=args.icon,
+            package_name=args.package_name,
+            app_name=args.app_name,
+            assume_yes=args.yes,
+            refresh=args.refresh,
+            stale_scan=args.stale_scan
+        )
+        raise SystemExit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\nRename cancelled by user.")
+        raise SystemExit(1)
+    except EOFError:
+        print("\n✗ No input available; pass --package-name, --app-name and --yes to run non-interactively")
+        raise SystemExit(1)
     except Exception as e:
         print(f"\nUnexpected error: {e}")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
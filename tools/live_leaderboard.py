@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Live Leaderboard
+
+Streams end-by-end scorecard updates (JSON lines) and keeps a ranked
+leaderboard up to date incrementally. Archers are ordered by total, then by
+X, 10 and 9 counts - the tie-break figures ScoringGrid shows through
+_calculateXAndTenCounts - and finally by name.
+
+Each update is {"archer": ..., "end": N, "arrows": ["X", "9", "M"]}. A second
+update for the same archer and end is a correction: it replaces that end's
+contribution instead of adding to it.
+
+The ranking lives in an indexable skip list, so an update costs O(log n)
+and the top k can be read at any time in O(k) without re-sorting.
+
+Usage:
+    python live_leaderboard.py [UPDATES.jsonl] [--top K] [--every N]
+
+Reads standard input when no file is given.
+"""
+
+import sys
+import json
+import random
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from scorecard_engine import X, encode_score
+
+
+MAX_LEVELS = 24
+
+EndStats = Tuple[int, int, int, int]
+
+
+class _Node:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, levels: int):
+        self.key = key
+        self.next: List[Optional['_Node']] = [None] * levels
+        self.width = [1] * levels
+
+
+class IndexableSkipList:
+    """Sorted collection with O(log n) insert, remove, rank and positional lookup."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.head = _Node(None, MAX_LEVELS)
+        self.size = 0
+        self.random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _random_levels(self) -> int:
+        levels = 1
+        while levels < MAX_LEVELS and self.random.random() < 0.5:
+            levels += 1
+        return levels
+
+    def _find_chain(self, key) -> Tuple[List[_Node], List[int]]:
+        """Last node before key on every level, and the steps taken on each level."""
+        chain = [self.head] * MAX_LEVELS
+        steps = [0] * MAX_LEVELS
+        node = self.head
+        for level in range(MAX_LEVELS - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        return chain, steps
+
+    def insert(self, key):
+        """Insert a key."""
+        chain, steps_at_level = self._find_chain(key)
+        levels = self._random_levels()
+        node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            previous = chain[level]
+            node.next[level] = previous.next[level]
+            previous.next[level] = node
+            node.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, MAX_LEVELS):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, key):
+        """Remove a key; raises KeyError if it is not present."""
+        chain, _ = self._find_chain(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for level in range(len(node.next)):
+            previous = chain[level]
+            previous.width[level] += node.width[level] - 1
+            previous.next[level] = node.next[level]
+        for level in range(len(node.next), MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def index(self, key) -> int:
+        """Zero-based position of a key; raises KeyError if it is not present."""
+        chain, steps = self._find_chain(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        return sum(steps)
+
+    def __getitem__(self, position: int):
+        if not 0 <= position < self.size:
+            raise IndexError(position)
+        node = self.head
+        remaining = position + 1
+        for level in range(MAX_LEVELS - 1, -1, -1):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node.key
+
+    def __iter__(self) -> Iterator:
+        node = self.head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+
+def end_stats(arrows: List[str]) -> EndStats:
+    """Total, X, 10 and 9 counts of one end, scored like ScoringGrid."""
+    codes = [encode_score(arrow) for arrow in arrows]
+    return (sum(min(max(code, 0), 10) for code in codes),
+            codes.count(X), codes.count(10), codes.count(9))
+
+
+class Leaderboard:
+    """Incrementally ranked archer totals."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.ends: Dict[str, Dict[int, EndStats]] = {}
+        self.stats: Dict[str, List[int]] = {}
+        self.ranking = IndexableSkipList(seed)
+
+    def _key(self, archer: str) -> tuple:
+        total, x_count, ten_count, nine_count = self.stats[archer]
+        return (-total, -x_count, -ten_count, -nine_count, archer)
+
+    def apply(self, archer: str, end: int, arrows: List[str]) -> int:
+        """Apply one end update (or correction) and return the archer's new rank."""
+        new = end_stats(arrows)
+        if archer in self.stats:
+            self.ranking.remove(self._key(archer))
+        else:
+            self.stats[archer] = [0, 0, 0, 0]
+            self.ends[archer] = {}
+
+        old = self.ends[archer].get(end, (0, 0, 0, 0))
+        self.ends[archer][end] = new
+        stats = self.stats[archer]
+        for i in range(4):
+            stats[i] += new[i] - old[i]
+
+        key = self._key(archer)
+        self.ranking.insert(key)
+        return self.ranking.index(key) + 1
+
+    def rank(self, archer: str) -> int:
+        """1-based rank of an archer."""
+        return self.ranking.index(self._key(archer)) + 1
+
+    def top(self, k: int) -> List[Dict]:
+        """The first k rows of the leaderboard."""
+        rows = []
+        for position, key in enumerate(self.ranking):
+            if position >= k:
+                break
+            total, x_count, ten_count, nine_count, archer = key
+            rows.append({'rank': position + 1, 'archer': archer, 'total': -total,
+                         'x': -x_count, '10': -ten_count, '9': -nine_count})
+        return rows
+
+    def display(self, k: int):
+        """Print the top k rows."""
+        print(f"{'Rank':>4}  {'Archer':24} {'Total':>6} {'X':>4} {'10':>4} {'9':>4}")
+        for row in self.top(k):
+            print(f"{row['rank']:>4}  {row['archer']:24} {row['total']:>6} {row['x']:>4} {row['10']:>4} {row['9']:>4}")
+
+
+def read_updates(lines: Iterable[str]) -> Iterator[Dict]:
+    """Parse JSON-line end updates, skipping blank and malformed lines.
+
+    Lines with arrows that are not keypad scores count as malformed.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            update = json.loads(line)
+            arrows = list(update['arrows'])
+            for arrow in arrows:
+                encode_score(arrow)
+            parsed = {'archer': str(update['archer']), 'end': int(update['end']), 'arrows': arrows}
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"⚠ Warning: Skipping line {line_number}: {e}", file=sys.stderr)
+            continue
+        yield parsed
+
+
+def ingest(updates: Iterable[Dict], leaderboard: Leaderboard) -> Iterator[Tuple[str, int]]:
+    """Apply updates as they arrive, yielding (archer, rank) after each one."""
+    for update in updates:
+        yield update['archer'], leaderboard.apply(update['archer'], update['end'], update['arrows'])
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Maintain a live leaderboard from JSON-line end updates.")
+    parser.add_argument('updates', nargs='?', help="JSON-lines file of end updates (default: standard input)")
+    parser.add_argument('--top', type=int, default=10, help="Rows to show (default: 10)")
+    parser.add_argument('--every', type=int, default=0, help="Also show the leaderboard after every N updates")
+    args = parser.parse_args()
+
+    source: TextIO = open(args.updates, 'r', encoding='utf-8') if args.updates else sys.stdin
+    leaderboard = Leaderboard()
+    count = 0
+    try:
+        for count, _ in enumerate(ingest(read_updates(source), leaderboard), start=1):
+            if args.every and count % args.every == 0:
+                print(f"\nAfter {count} updates:")
+                leaderboard.display(args.top)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    print(f"\nFinal leaderboard ({count} updates, {len(leaderboard.ranking)} archers):")
+    leaderboard.display(args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Rename Run History
+
+Keeps a compact record of every rename run (project, parameters, per-step
+duration, bytes read/written and Flutter subprocess time) in a local SQLite
+database, and reports percentiles, slowest stages and weekly trends.
+
+Records are buffered in memory and written in a single transaction when the
+buffer fills or the process exits, so recording adds no I/O to the run itself.
+
+The database lives in ~/.flutter_rename/history.sqlite3 unless the
+FLUTTER_RENAME_HISTORY environment variable points elsewhere.
+"""
+
+import os
+import json
+import math
+import time
+import atexit
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+HISTORY_ENV_VAR = "FLUTTER_RENAME_HISTORY"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    project TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    flutter_seconds REAL NOT NULL,
+    bytes_read INTEGER NOT NULL,
+    bytes_written INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    duration REAL NOT NULL,
+    bytes_read INTEGER NOT NULL,
+    bytes_written INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_project_started ON runs(project, started_at);
+CREATE INDEX IF NOT EXISTS steps_run ON steps(run_id);
+"""
+
+
+def default_history_path() -> Path:
+    """Return the history database path, honouring FLUTTER_RENAME_HISTORY."""
+    override = os.environ.get(HISTORY_ENV_VAR)
+    if override:
+        return Path(override)
+    return Path.home() / ".flutter_rename" / "history.sqlite3"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class RunHistory:
+    def __init__(self, db_path: Optional[str] = None, batch_size: int = 50):
+        self.db_path = Path(db_path) if db_path else default_history_path()
+        self.batch_size = batch_size
+        self.pending: List[Dict] = []
+        atexit.register(self.flush)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def add(self, record: Dict):
+        """Queue a run record; it is written with the next batch."""
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all queued records in one transaction."""
+        if not self.pending:
+            return
+        records, self.pending = self.pending, []
+        try:
+            connection = self._connect()
+            with connection:
+                for record in records:
+                    cursor = connection.execute(
+                        "INSERT INTO runs (started_at, project, parameters, success, duration, "
+                        "flutter_seconds, bytes_read, bytes_written) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (record['started_at'], record['project'], json.dumps(record['parameters'], sort_keys=True),
+                         int(record['success']), record['duration'], record['flutter_seconds'],
+                         record['bytes_read'], record['bytes_written'])
+                    )
+                    connection.executemany(
+                        "INSERT INTO steps (run_id, name, duration, bytes_read, bytes_written) VALUES (?, ?, ?, ?, ?)",
+                        [(cursor.lastrowid, step['name'], step['duration'], step['bytes_read'], step['bytes_written'])
+                         for step in record['steps']]
+                    )
+            connection.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠ Warning: Could not write rename history: {e}")
+
+    def load_runs(self, project: Optional[str] = None, days: Optional[int] = None) -> List[Dict]:
+        """Load run records (with their steps), oldest first."""
+        self.flush()
+        if not self.db_path.exists():
+            return []
+        conditions, arguments = [], []
+        if project:
+            conditions.append("project = ?")
+            arguments.append(str(Path(project).resolve()))
+        if days:
+            conditions.append("started_at >= ?")
+            arguments.append(time.time() - days * 86400)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        connection = self._connect()
+        runs = {}
+        for row in connection.execute(
+                f"SELECT id, started_at, project, parameters, success, duration, flutter_seconds, "
+                f"bytes_read, bytes_written FROM runs {where} ORDER BY started_at", arguments):
+            runs[row[0]] = {
+                'started_at': row[1], 'project': row[2], 'parameters': json.loads(row[3]),
+                'success': bool(row[4]), 'duration': row[5], 'flutter_seconds': row[6],
+                'bytes_read': row[7], 'bytes_written': row[8], 'steps': [],
+            }
+        if runs:
+            for run_id, name, duration, bytes_read, bytes_written in connection.execute(
+                    f"SELECT run_id, name, duration, bytes_read, bytes_written FROM steps "
+                    f"WHERE run_id IN (SELECT id FROM runs {where})", arguments):
+                runs[run_id]['steps'].append({
+                    'name': name, 'duration': duration, 'bytes_read': bytes_read, 'bytes_written': bytes_written,
+                })
+        connection.close()
+        return list(runs.values())
+
+    def display_report(self, project: Optional[str] = None, days: Optional[int] = None, slowest: int = 5):
+        """Print percentiles, slowest stages and weekly trends."""
+        runs = self.load_runs(project, days)
+
+        print("\n" + "="*60)
+        print("RENAME HISTORY")
+        print("="*60)
+        if not runs:
+            print("No runs recorded")
+            print("="*60)
+            return
+
+        durations = sorted(run['duration'] for run in runs)
+        flutter_times = sorted(run['flutter_seconds'] for run in runs)
+        successes = sum(1 for run in runs if run['success'])
+        print(f"Runs                : {len(runs)} ({successes} successful)")
+        print(f"Projects            : {len({run['project'] for run in runs})}")
+        print(f"Duration p50/p90/p99: {percentile(durations, 0.5):.3f}s / "
+              f"{percentile(durations, 0.9):.3f}s / {percentile(durations, 0.99):.3f}s")
+        print(f"Flutter time p50/p90: {percentile(flutter_times, 0.5):.3f}s / {percentile(flutter_times, 0.9):.3f}s")
+        print(f"Avg bytes read/write: {sum(r['bytes_read'] for r in runs) // len(runs)} / "
+              f"{sum(r['bytes_written'] for r in runs) // len(runs)}")
+
+        step_durations: Dict[str, List[float]] = {}
+        for run in runs:
+            for step in run['steps']:
+                step_durations.setdefault(step['name'], []).append(step['duration'])
+        if step_durations:
+            print("\nSlowest stages (by p90):")
+            print(f"  {'Stage':24} {'Runs':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'Max':>9}")
+            ranked = sorted(step_durations.items(), key=lambda item: percentile(sorted(item[1]), 0.9), reverse=True)
+            for name, values in ranked[:slowest]:
+                values.sort()
+                print(f"  {name:24} {len(values):>6} {percentile(values, 0.5):>8.3f}s {percentile(values, 0.9):>8.3f}s "
+                      f"{percentile(values, 0.99):>8.3f}s {values[-1]:>8.3f}s")
+
+        weeks: Dict[str, List[float]] = {}
+        for run in runs:
+            year, week, _ = datetime.fromtimestamp(run['started_at']).isocalendar()
+            weeks.setdefault(f"{year}-W{week:02d}", []).append(run['duration'])
+        print("\nWeekly trend:")
+        print(f"  {'Week':10} {'Runs':>6} {'Mean':>9} {'p90':>9}")
+        for week, values in sorted(weeks.items()):
+            values.sort()
+            print(f"  {week:10} {len(values):>6} {sum(values) / len(values):>8.3f}s {percentile(values, 0.9):>8.3f}s")
+        print("="*60)
+
+
+_shared_history: Optional[RunHistory] = None
+
+
+def get_history() -> RunHistory:
+    """Return the process-wide history, so batch runs share one write buffer."""
+    global _shared_history
+    if _shared_history is None or _shared_history.db_path != default_history_path():
+        if _shared_history is not None:
+            _shared_history.flush()
+        _shared_history = RunHistory()
+    return _shared_history
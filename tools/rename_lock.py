@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Advisory locking for concurrent renames.
+
+Several renamer jobs may run against the same workspace. Each job holds a
+shared lock on the project and an exclusive lock on every file it is about to
+modify, so renames touching disjoint files run in parallel while conflicting
+ones fail fast. File locks are always taken in sorted path order, so two jobs
+can never wait on each other in a cycle.
+
+Locks are fcntl.flock locks on files under .flutter_rename/locks/ (msvcrt on
+Windows, where the project lock is exclusive as well).
+"""
+
+import os
+import time
+import hashlib
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+STATE_DIR_NAME = ".flutter_rename"
+
+
+class RenameConflictError(Exception):
+    """Raised when another job holds a lock or a file changed since it was detected."""
+
+
+def _try_lock(fd: int, exclusive: bool) -> bool:
+    """Attempt a non-blocking lock on fd."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+class RenameLocks:
+    """Context manager holding the project lock plus one lock per target file."""
+
+    def __init__(self, project_root: str, relative_paths: Iterable[str] = (),
+                 exclusive_project: bool = False, project_timeout: float = 60.0):
+        self.project_root = Path(project_root).resolve()
+        self.lock_dir = self.project_root / STATE_DIR_NAME / "locks"
+        self.relative_paths = sorted({Path(p).as_posix() for p in relative_paths})
+        self.exclusive_project = exclusive_project
+        self.project_timeout = project_timeout
+        self._held: List[int] = []
+
+    def _open(self, name: str) -> int:
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        return os.open(self.lock_dir / name, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _acquire(self, name: str, exclusive: bool, timeout: Optional[float], description: str):
+        fd = self._open(name)
+        deadline = time.monotonic() + (timeout or 0)
+        while not _try_lock(fd, exclusive):
+            if timeout is None or time.monotonic() >= deadline:
+                os.close(fd)
+                raise RenameConflictError(f"{description} is locked by another rename job")
+            time.sleep(0.05)
+        self._held.append(fd)
+
+    def acquire(self):
+        """Take the project lock, then every file lock in sorted order."""
+        try:
+            # The project lock is only held exclusively by whole-project steps
+            # such as 'flutter clean', so it is worth waiting for briefly
+            self._acquire("project.lock", self.exclusive_project, self.project_timeout, "Project")
+            for relative_path in self.relative_paths:
+                digest = hashlib.sha1(relative_path.encode('utf-8')).hexdigest()[:16]
+                self._acquire(f"{digest}.lock", True, None, relative_path)
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self):
+        """Release all held locks in reverse order."""
+        while self._held:
+            _unlock(self._held.pop())
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
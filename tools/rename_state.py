@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Rename State Snapshot
+
+After each successful rename the renamer stores the identifiers it applied
+and, for every configuration file it parses, a fingerprint (size, mtime_ns,
+sha256) together with the values parsed from it. The next run trusts the
+stored values for files whose fingerprint still matches and re-parses only
+the files that changed, so a repeat rename costs as much as its diff.
+
+The snapshot lives in .flutter_rename/state.json.
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+from rename_lock import STATE_DIR_NAME
+
+
+STATE_FILE_NAME = "state.json"
+STATE_VERSION = 1
+
+
+class RenameState:
+    def __init__(self, project_root: str, state_path: Optional[str] = None):
+        self.project_root = Path(project_root).resolve()
+        self.state_path = Path(state_path) if state_path else self.project_root / STATE_DIR_NAME / STATE_FILE_NAME
+        self.identifiers: Dict[str, str] = {}
+        self.files: Dict[str, Dict] = {}
+
+    def load(self) -> bool:
+        """Load the snapshot. Returns False (with an empty state) if there is none."""
+        self.identifiers, self.files = {}, {}
+        if not self.state_path.exists():
+            return False
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != STATE_VERSION:
+                return False
+            self.identifiers = dict(data['identifiers'])
+            self.files = dict(data['files'])
+            return True
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠ Warning: Ignoring unreadable rename state: {e}")
+            return False
+
+    def save(self):
+        """Write the snapshot atomically."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.state_path.with_suffix('.tmp')
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'identifiers': self.identifiers, 'files': self.files},
+                      f, indent=2, sort_keys=True, ensure_ascii=False)
+        temporary_path.replace(self.state_path)
+
+    def lookup(self, relative_path: str) -> Optional[Dict]:
+        """Return the stored entry for a file if its content is unchanged, else None.
+
+        A matching size and mtime is trusted outright; if only the mtime
+        moved, the content hash decides and the entry's mtime is refreshed.
+        """
+        entry = self.files.get(relative_path)
+        if entry is None:
+            return None
+        try:
+            stat = (self.project_root / relative_path).stat()
+        except OSError:
+            return None
+        if stat.st_size != entry['size']:
+            return None
+        if stat.st_mtime_ns != entry['mtime_ns']:
+            with open(self.project_root / relative_path, 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != entry['sha256']:
+                    return None
+            entry['mtime_ns'] = stat.st_mtime_ns
+        return entry
+
+    def record(self, relative_path: str, sha256: str, size: int, mtime_ns: int, config: Dict[str, str]):
+        """Store the fingerprint of a file as it was read or written, and the values parsed from it."""
+        self.files[relative_path] = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'sha256': sha256,
+            'config': config,
+        }
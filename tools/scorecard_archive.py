@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Scorecard Archive
+
+Compact, memory-mapped columnar archive for historical scorecards. Every
+arrow takes one int8 in the scorecard_engine encoding, and cards are stored
+as fixed-width blocks per layout: 3-arrow cards as 10x3 and 6-arrow cards as
+6x6. A small fixed-size index record per card points into its layout block.
+
+File layout (little-endian, sections aligned to 64 bytes):
+
+    header    64 bytes   magic, version, card counts, section offsets
+    cards3    n3 x 30    int8, shape (n3, 10, 3)
+    cards6    n6 x 36    int8, shape (n6, 6, 6)
+    index     n x 16     archer_id u4, event_date i4 (days since 1970-01-01),
+                         arrows_per_end u1, ruleset u1, reserved u2, slot u4
+
+The reader memory-maps the file and exposes zero-copy NumPy views, so
+season-wide queries never build Python strings.
+
+Usage:
+    python scorecard_archive.py pack CARDS.jsonl ARCHIVE
+    python scorecard_archive.py info ARCHIVE
+    python scorecard_archive.py convert ARCHIVE OUTPUT [3|6]
+
+Each JSON line holds archer_id, date (YYYY-MM-DD), arrows_per_end and scores
+(the app's List<List<String>>); ruleset ("indoor"/"outdoor") is optional.
+convert re-sorts every end and, given an arrow count, moves all cards to
+that layout the way the app does when switching arrows per end.
+"""
+
+import sys
+import json
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from scorecard_engine import ENDS_PER_SET, convert_layout, encode_scorecard
+
+
+MAGIC = b'ABKSCARC'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+INDOOR = 0
+OUTDOOR = 1
+RULESETS = {'indoor': INDOOR, 'outdoor': OUTDOOR}
+
+# The app ties the ruleset to the arrow count: 3 arrows indoor, 6 outdoor
+DEFAULT_RULESET = {3: INDOOR, 6: OUTDOOR}
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u2'),
+    ('reserved', '<u2'),
+    ('card_count', '<u4'),
+    ('count3', '<u4'),
+    ('count6', '<u4'),
+    ('cards3_offset', '<u8'),
+    ('cards6_offset', '<u8'),
+    ('index_offset', '<u8'),
+    ('padding', 'V16'),
+])
+assert HEADER_DTYPE.itemsize == ALIGNMENT
+
+INDEX_DTYPE = np.dtype([
+    ('archer_id', '<u4'),
+    ('event_date', '<i4'),
+    ('arrows_per_end', 'u1'),
+    ('ruleset', 'u1'),
+    ('reserved', '<u2'),
+    ('slot', '<u4'),
+])
+
+LAYOUT_SHAPES = {arrows: (ends, arrows) for arrows, ends in ENDS_PER_SET.items()}
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _to_days(event_date: Union[date, str, int, None]) -> int:
+    if event_date is None:
+        return 0
+    if isinstance(event_date, int):
+        return event_date
+    if isinstance(event_date, str):
+        event_date = date.fromisoformat(event_date)
+    return (event_date - date(1970, 1, 1)).days
+
+
+class ScorecardArchiveWriter:
+    """Collect scorecards and write them as one archive file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.blocks: Dict[int, List[np.ndarray]] = {3: [], 6: []}
+        self.counts = {3: 0, 6: 0}
+        self.index_records: List[tuple] = []
+
+    def add_codes(self, codes: np.ndarray, arrows_per_end: int, archer_ids, event_dates=None, rulesets=None):
+        """Add already encoded cards of one layout, shape (cards, ends, arrows)."""
+        if arrows_per_end not in LAYOUT_SHAPES:
+            raise ValueError(f"Unsupported arrows per end: {arrows_per_end}")
+        codes = np.asarray(codes, dtype=np.int8)
+        if codes.ndim == 2:
+            codes = codes[np.newaxis]
+        if codes.shape[1:] != LAYOUT_SHAPES[arrows_per_end]:
+            raise ValueError(f"Expected cards of shape {LAYOUT_SHAPES[arrows_per_end]}, got {codes.shape[1:]}")
+
+        count = codes.shape[0]
+        archer_ids = np.broadcast_to(np.asarray(archer_ids), (count,))
+        event_dates = [None] * count if event_dates is None else np.broadcast_to(np.asarray(event_dates, dtype=object), (count,))
+        rulesets = np.broadcast_to(np.asarray(DEFAULT_RULESET[arrows_per_end] if rulesets is None else rulesets), (count,))
+
+        first_slot = self.counts[arrows_per_end]
+        for i in range(count):
+            ruleset = rulesets[i]
+            self.index_records.append((
+                int(archer_ids[i]), _to_days(event_dates[i]), arrows_per_end,
+                RULESETS[ruleset] if isinstance(ruleset, str) else int(ruleset), 0, first_slot + i,
+            ))
+        self.blocks[arrows_per_end].append(codes)
+        self.counts[arrows_per_end] += count
+
+    def add(self, scores: List[List[str]], arrows_per_end: int, archer_id: int,
+            event_date: Union[date, str, int, None] = None, ruleset: Union[str, int, None] = None):
+        """Add one scorecard in the app's List<List<String>> shape."""
+        self.add_codes(encode_scorecard(scores, arrows_per_end), arrows_per_end, archer_id,
+                       [event_date], ruleset)
+
+    def write(self):
+        """Write the archive file."""
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        cards3_offset = ALIGNMENT
+        cards6_offset = _align(cards3_offset + self.counts[3] * 30)
+        index_offset = _align(cards6_offset + self.counts[6] * 36)
+        header[0] = (MAGIC, FORMAT_VERSION, 0, len(self.index_records), self.counts[3], self.counts[6],
+                     cards3_offset, cards6_offset, index_offset, b'\0' * 16)
+        index = np.array(self.index_records, dtype=INDEX_DTYPE)
+
+        with open(self.path, 'wb') as f:
+            f.write(header.tobytes())
+            for arrows_per_end, offset in ((3, cards3_offset), (6, cards6_offset)):
+                f.seek(offset)
+                for block in self.blocks[arrows_per_end]:
+                    f.write(block.tobytes())
+            f.seek(index_offset)
+            f.write(index.tobytes())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.write()
+        return False
+
+
+class ScorecardArchive:
+    """Read-only, memory-mapped view of an archive file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        header = np.fromfile(self.path, dtype=HEADER_DTYPE, count=1)
+        if len(header) != 1 or header[0]['magic'] != MAGIC:
+            raise ValueError(f"{self.path} is not a scorecard archive")
+        if header[0]['version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported archive version {header[0]['version']}")
+        self.header = header[0]
+
+        self.cards3 = self._map(np.int8, int(self.header['cards3_offset']), (int(self.header['count3']),) + LAYOUT_SHAPES[3])
+        self.cards6 = self._map(np.int8, int(self.header['cards6_offset']), (int(self.header['count6']),) + LAYOUT_SHAPES[6])
+        self.index = self._map(INDEX_DTYPE, int(self.header['index_offset']), (int(self.header['card_count']),))
+
+    def _map(self, dtype, offset: int, shape: tuple) -> np.ndarray:
+        if 0 in shape:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def layout(self, arrows_per_end: int) -> np.ndarray:
+        """All cards of one layout, shape (cards, ends, arrows)."""
+        return self.cards3 if arrows_per_end == 3 else self.cards6
+
+    def card(self, position: int) -> np.ndarray:
+        """Codes of one card by index position, as a view."""
+        record = self.index[position]
+        return self.layout(int(record['arrows_per_end']))[int(record['slot'])]
+
+    def select(self, arrows_per_end: int, archer_id: Optional[int] = None, ruleset: Optional[int] = None,
+               start_date: Union[date, str, None] = None, end_date: Union[date, str, None] = None) -> np.ndarray:
+        """Slots of matching cards within layout(arrows_per_end)."""
+        index = self.index
+        mask = index['arrows_per_end'] == arrows_per_end
+        if archer_id is not None:
+            mask &= index['archer_id'] == archer_id
+        if ruleset is not None:
+            mask &= index['ruleset'] == ruleset
+        if start_date is not None:
+            mask &= index['event_date'] >= _to_days(start_date)
+        if end_date is not None:
+            mask &= index['event_date'] <= _to_days(end_date)
+        return index['slot'][mask]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+def convert_archive(source_path: str, destination_path: str, arrows_per_end: Optional[int] = None) -> int:
+    """Re-sort every end, optionally converting all cards to one layout.
+
+    Each layout block is converted with a single batched operation. Card
+    order, archers and dates are kept; converted cards take the ruleset the
+    app uses for their new layout. Returns the card count.
+    """
+    archive = ScorecardArchive(source_path)
+    writer = ScorecardArchiveWriter(destination_path)
+    index = np.array(archive.index)
+    masks = {old_arrows: index['arrows_per_end'] == old_arrows for old_arrows in (3, 6)}
+    for old_arrows, mask in masks.items():
+        new_arrows = arrows_per_end or old_arrows
+        block = archive.layout(old_arrows)
+        index['slot'][mask] += writer.counts[new_arrows]
+        if new_arrows != old_arrows:
+            index['arrows_per_end'][mask] = new_arrows
+            index['ruleset'][mask] = DEFAULT_RULESET[new_arrows]
+        if len(block):
+            writer.blocks[new_arrows].append(convert_layout(block, old_arrows, new_arrows))
+            writer.counts[new_arrows] += len(block)
+    writer.index_records = index.tolist()
+    writer.write()
+    return len(index)
+
+
+def pack_json_lines(input_path: str, archive_path: str) -> int:
+    """Pack a JSON-lines file of scorecards into an archive. Returns the card count.
+
+    Raises ValueError naming the line of the first card that cannot be
+    stored exactly, such as one with a cell that is not a keypad score; no
+    archive is written in that case.
+    """
+    with ScorecardArchiveWriter(archive_path) as writer, open(input_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                card = json.loads(line)
+                writer.add(card['scores'], int(card['arrows_per_end']), int(card['archer_id']),
+                           card.get('date'), card.get('ruleset'))
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"Line {line_number}: {e}") from e
+    return len(writer.index_records)
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) == 4 and sys.argv[1] == 'pack':
+        try:
+            count = pack_json_lines(sys.argv[2], sys.argv[3])
+        except ValueError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        print(f"✓ Packed {count} scorecards into {sys.argv[3]}")
+    elif len(sys.argv) == 3 and sys.argv[1] == 'info':
+        archive = ScorecardArchive(sys.argv[2])
+        print(f"Cards        : {len(archive)}")
+        print(f"3-arrow cards: {len(archive.cards3)}")
+        print(f"6-arrow cards: {len(archive.cards6)}")
+        print(f"Archers      : {len(np.unique(archive.index['archer_id']))}")
+    elif len(sys.argv) in (4, 5) and sys.argv[1] == 'convert':
+        arrows_per_end = int(sys.argv[4]) if len(sys.argv) == 5 else None
+        if arrows_per_end not in (None, 3, 6):
+            print("✗ Arrows per end must be 3 or 6")
+            sys.exit(1)
+        count = convert_archive(sys.argv[2], sys.argv[3], arrows_per_end)
+        print(f"✓ Converted {count} scorecards into {sys.argv[3]}")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Scorecard Engine
+
+Vectorized scoring for whole batches of archery scorecards, matching the
+ScoringGrid widget (lib/presentation/widgets/scoring_grid/scoring_grid.dart).
+
+Cells are encoded as small integers in the order _sortEndScores ranks them:
+X = 11, "10".."1" = 10..1, M = -1, and empty cells are EMPTY = -2 so they
+rank below a miss. A batch is an int8 array of shape (cards, ends, arrows).
+Only the keypad values ('X', '10'..'1', 'M'), '0' and the empty string are
+accepted. Anything else, such as '11' or ' 9', raises ValueError rather than
+being mapped to another value, so encoded cards always decode back to the
+exact strings that were stored.
+
+Requires NumPy (pip install numpy).
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+X = 11
+MISS = -1
+EMPTY = -2
+
+# Ends per set for each arrows-per-end ruleset, as set by ScoringPage
+ENDS_PER_SET = {3: 10, 6: 6}
+
+# ScoringGrid always shows 12 visual rows of 3 arrows
+VISUAL_ROWS = 12
+ARROWS_PER_ROW = 3
+
+_CODE_BY_SCORE = {'X': X, 'M': MISS, '': EMPTY, **{str(value): value for value in range(11)}}
+_SCORE_BY_CODE = {code: score for score, code in _CODE_BY_SCORE.items()}
+
+
+def encode_score(score: str) -> int:
+    """Encode a single cell string; raises ValueError for non-keypad values."""
+    try:
+        return _CODE_BY_SCORE[score]
+    except (KeyError, TypeError):
+        raise ValueError(f"Not a keypad score: {score!r}") from None
+
+
+def decode_score(code: int) -> str:
+    """Decode a single cell code back to the string the app stores."""
+    return _SCORE_BY_CODE[int(code)]
+
+
+def encode_scorecard(scores: List[List[str]], arrows_per_end: int, ends: int = None) -> np.ndarray:
+    """Encode one List<List<String>> scorecard into an (ends, arrows) array.
+
+    Missing ends or arrows are filled with EMPTY; extra ones are dropped.
+    """
+    ends = ENDS_PER_SET.get(arrows_per_end, len(scores)) if ends is None else ends
+    codes = np.full((ends, arrows_per_end), EMPTY, dtype=np.int8)
+    for end_index, end in enumerate(scores[:ends]):
+        row = [encode_score(score) for score in end[:arrows_per_end]]
+        codes[end_index, :len(row)] = row
+    return codes
+
+
+def encode_batch(cards: Sequence[List[List[str]]], arrows_per_end: int, ends: int = None) -> np.ndarray:
+    """Encode many scorecards of the same layout into a (cards, ends, arrows) array."""
+    ends = ENDS_PER_SET.get(arrows_per_end) if ends is None else ends
+    if ends is None:
+        ends = max((len(card) for card in cards), default=0)
+    batch = np.full((len(cards), ends, arrows_per_end), EMPTY, dtype=np.int8)
+    for card_index, card in enumerate(cards):
+        batch[card_index] = encode_scorecard(card, arrows_per_end, ends)
+    return batch
+
+
+def decode_batch(codes: np.ndarray) -> List[List[List[str]]]:
+    """Decode a (cards, ends, arrows) array back into the app's string layout."""
+    return [[[_SCORE_BY_CODE[code] for code in end] for end in card] for card in codes.tolist()]
+
+
+def arrow_points(codes: np.ndarray) -> np.ndarray:
+    """Points per arrow: X scores 10, M and empty score 0."""
+    return np.clip(codes, 0, 10).astype(np.int16)
+
+
+def end_totals(codes: np.ndarray) -> np.ndarray:
+    """Total of each end (_calculateEndTotal), shape (cards, ends)."""
+    return arrow_points(codes).sum(axis=-1, dtype=np.int32)
+
+
+def sum_of_three(codes: np.ndarray) -> np.ndarray:
+    """Sum of the first three arrows of each end (_calculateSumOfThreeForLogicalEnd)."""
+    return arrow_points(codes[..., :3]).sum(axis=-1, dtype=np.int32)
+
+
+def sum_of_six(codes: np.ndarray, arrows_per_end: int) -> np.ndarray:
+    """Sum of six arrows per end (_calculateSumOfSixForLogicalEnd).
+
+    In 6-arrow mode this is the end total. In 3-arrow mode odd ends carry the
+    total of themselves and the previous end, and even ends are 0.
+    """
+    totals = end_totals(codes)
+    if arrows_per_end == 6:
+        return totals
+    sums = np.zeros_like(totals)
+    odd_totals = totals[..., 1::2]
+    sums[..., 1::2] = totals[..., 0::2][..., :odd_totals.shape[-1]] + odd_totals
+    return sums
+
+
+def running_totals(codes: np.ndarray) -> np.ndarray:
+    """Accumulative total after each end (_calculateAccumulative), via a prefix sum."""
+    return np.cumsum(end_totals(codes), axis=-1, dtype=np.int32)
+
+
+def ring_counts(codes: np.ndarray) -> Dict[str, np.ndarray]:
+    """X, 10 and 9 counts per card (_calculateXAndTenCounts)."""
+    flat = codes.reshape(codes.shape[0], -1)
+    return {
+        'X': np.count_nonzero(flat == X, axis=1),
+        '10': np.count_nonzero(flat == 10, axis=1),
+        '9': np.count_nonzero(flat == 9, axis=1),
+    }
+
+
+def score_batch(codes: np.ndarray, arrows_per_end: int) -> Dict[str, np.ndarray]:
+    """Compute every ScoringGrid figure for a batch of scorecards at once."""
+    totals = end_totals(codes)
+    running = np.cumsum(totals, axis=-1, dtype=np.int32)
+    counts = ring_counts(codes)
+    return {
+        'end_totals': totals,
+        'sum_of_three': sum_of_three(codes),
+        'sum_of_six': sum_of_six(codes, arrows_per_end),
+        'running_totals': running,
+        'final_score': running[..., -1] if running.shape[-1] else np.zeros(codes.shape[0], dtype=np.int32),
+        'x_count': counts['X'],
+        'ten_count': counts['10'],
+        'nine_count': counts['9'],
+    }
+
+
+def sort_ends(codes: np.ndarray) -> np.ndarray:
+    """Sort every end descending (_sortEndScores): X > 10 > ... > 1 > M, empties last."""
+    return np.ascontiguousarray(np.sort(codes, axis=-1)[..., ::-1])
+
+
+def convert_layout(codes: np.ndarray, old_arrows_per_end: int, new_arrows_per_end: int) -> np.ndarray:
+    """Convert a batch between layouts like _preserveScoresWithNewArrowCount.
+
+    Arrows are read in visual row order (12 rows of 3), which for full-width
+    ends is plain row-major order, then refilled into the new layout row by
+    row, dropping what does not fit and padding with EMPTY. Every end of the
+    result is sorted.
+    """
+    if codes.shape[-1] != old_arrows_per_end:
+        raise ValueError(f"Expected {old_arrows_per_end} arrows per end, got {codes.shape[-1]}")
+    new_ends = ENDS_PER_SET[new_arrows_per_end]
+    new_size = new_ends * new_arrows_per_end
+    flat = codes.reshape(codes.shape[0], -1)[:, :VISUAL_ROWS * ARROWS_PER_ROW]
+    converted = np.full((codes.shape[0], new_size), EMPTY, dtype=np.int8)
+    kept = min(new_size, flat.shape[1])
+    converted[:, :kept] = flat[:, :kept]
+    return sort_ends(converted.reshape(-1, new_ends, new_arrows_per_end))
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Season Statistics
+
+Per-archer season statistics over a scorecard archive, split by ruleset
+(indoor/outdoor) and arrows per end: score distribution, ring hit histogram,
+end-total and sum-of-6 consistency, and X/10/9 rates.
+
+Cards are partitioned into slot ranges across a process pool. Each worker
+memory-maps the archive itself and reads the per-slot archer, ruleset and
+date columns from shared memory, so no card data is pickled. Workers return
+integer histograms and moments (count, sum, sum of squares) that merge
+exactly regardless of how the cards were split. End totals and sums of 6
+follow ScoringGrid (see scorecard_engine).
+
+Usage:
+    python season_stats.py ARCHIVE [--workers N] [--from DATE] [--to DATE] [--archer ID] [--json]
+"""
+
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from scorecard_archive import RULESETS, ScorecardArchive, _to_days
+from scorecard_engine import EMPTY, ENDS_PER_SET, MISS, X, end_totals, sum_of_six
+
+
+# Ring histogram bins: M, 0..10, X (empty cells are not counted)
+RING_LABELS = ['M'] + [str(value) for value in range(11)] + ['X']
+RING_BINS = len(RING_LABELS)
+
+MOMENTS = ('end_count', 'end_sum', 'end_sum_sq', 'six_count', 'six_sum', 'six_sum_sq',
+           'arrows', 'x_count', 'ten_count', 'nine_count', 'cards')
+
+GroupKey = Tuple[int, int, int]
+
+RULESET_NAMES = {value: name for name, value in RULESETS.items()}
+
+
+def max_score(arrows_per_end: int) -> int:
+    return ENDS_PER_SET[arrows_per_end] * arrows_per_end * 10
+
+
+class GroupStats:
+    """Exactly mergeable statistics for one (archer, ruleset, arrows per end) group."""
+
+    def __init__(self, arrows_per_end: int):
+        self.arrows_per_end = arrows_per_end
+        self.score_histogram = np.zeros(max_score(arrows_per_end) + 1, dtype=np.int64)
+        self.ring_histogram = np.zeros(RING_BINS, dtype=np.int64)
+        self.moments = np.zeros(len(MOMENTS), dtype=np.int64)
+
+    def merge(self, score_histogram: np.ndarray, ring_histogram: np.ndarray, moments: np.ndarray):
+        self.score_histogram += score_histogram
+        self.ring_histogram += ring_histogram
+        self.moments += moments
+
+    def __getitem__(self, name: str) -> int:
+        return int(self.moments[MOMENTS.index(name)])
+
+    @staticmethod
+    def _mean_variance(count: int, total: int, total_sq: int) -> Tuple[float, float]:
+        if not count:
+            return 0.0, 0.0
+        # Population variance from integer moments, without cancellation
+        return total / count, (count * total_sq - total * total) / (count * count)
+
+    def summary(self) -> Dict:
+        """Plain-dict summary of the group."""
+        scores = np.flatnonzero(self.score_histogram)
+        cards = self['cards']
+        end_mean, end_variance = self._mean_variance(self['end_count'], self['end_sum'], self['end_sum_sq'])
+        six_mean, six_variance = self._mean_variance(self['six_count'], self['six_sum'], self['six_sum_sq'])
+        arrows = self['arrows'] or 1
+        return {
+            'cards': cards,
+            'mean_score': float(np.dot(np.arange(len(self.score_histogram)), self.score_histogram) / cards) if cards else 0.0,
+            'best_score': int(scores[-1]) if len(scores) else 0,
+            'score_histogram': {int(score): int(self.score_histogram[score]) for score in scores},
+            'ring_histogram': dict(zip(RING_LABELS, self.ring_histogram.tolist())),
+            'end_mean': end_mean,
+            'end_variance': end_variance,
+            'six_mean': six_mean,
+            'six_variance': six_variance,
+            'x_rate': self['x_count'] / arrows,
+            'ten_rate': self['ten_count'] / arrows,
+            'nine_rate': self['nine_count'] / arrows,
+        }
+
+
+def _slot_columns(archive: ScorecardArchive, arrows_per_end: int, buffer) -> np.ndarray:
+    """Fill a (3, slots) array of archer id, ruleset and event date per slot of one layout block."""
+    index = archive.index
+    records = index[index['arrows_per_end'] == arrows_per_end]
+    columns = np.ndarray((3, len(archive.layout(arrows_per_end))), dtype=np.int64, buffer=buffer)
+    columns[0, records['slot']] = records['archer_id']
+    columns[1, records['slot']] = records['ruleset']
+    columns[2, records['slot']] = records['event_date']
+    return columns
+
+
+def compute_partial(archive_path: str, arrows_per_end: int, start: int, stop: int, columns_name: str,
+                    start_day: Optional[int] = None, end_day: Optional[int] = None,
+                    archer_id: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Statistics for cards [start, stop) of one layout block.
+
+    columns_name is the shared memory block holding that layout's slot
+    columns. Returns group keys (groups, 3) and, per group, the score
+    histogram, the ring histogram and the MOMENTS counters.
+    """
+    archive = ScorecardArchive(archive_path)
+    codes = archive.layout(arrows_per_end)[start:stop]
+    columns_block = shared_memory.SharedMemory(name=columns_name)
+    try:
+        columns = np.ndarray((3, len(archive.layout(arrows_per_end))), dtype=np.int64, buffer=columns_block.buf)
+        archers, rulesets, dates = columns[:, start:stop].copy()
+        del columns
+    finally:
+        columns_block.close()
+
+    selected = np.ones(len(codes), dtype=bool)
+    if start_day is not None:
+        selected &= dates >= start_day
+    if end_day is not None:
+        selected &= dates <= end_day
+    if archer_id is not None:
+        selected &= archers == archer_id
+    codes = np.asarray(codes[selected])
+    archers, rulesets = archers[selected], rulesets[selected]
+
+    group_ids, groups = np.unique(archers * 2 + rulesets, return_inverse=True)
+    group_count = len(group_ids)
+    keys = np.stack([group_ids // 2, group_ids % 2, np.full(group_count, arrows_per_end)], axis=1)
+
+    totals = end_totals(codes)
+    finals = totals.sum(axis=-1)
+    bins = max_score(arrows_per_end) + 1
+    score_histograms = np.bincount(groups * bins + finals, minlength=group_count * bins).reshape(group_count, bins)
+
+    arrow_groups = np.repeat(groups, codes.shape[1] * codes.shape[2])
+    flat_codes = codes.reshape(-1).astype(np.int64)
+    shot = flat_codes != EMPTY
+    ring_histograms = np.bincount(arrow_groups[shot] * RING_BINS + flat_codes[shot] - MISS,
+                                  minlength=group_count * RING_BINS).reshape(group_count, RING_BINS)
+
+    # Only ends with at least one arrow count towards end consistency
+    shot_ends = (codes != EMPTY).any(axis=-1)
+    sixes = sum_of_six(codes, arrows_per_end)
+    if arrows_per_end == 3:
+        shot_sixes = np.zeros_like(shot_ends)
+        shot_sixes[:, 1::2] = shot_ends[:, 0::2] | shot_ends[:, 1::2]
+    else:
+        shot_sixes = shot_ends
+
+    def end_moments(values: np.ndarray, mask: np.ndarray) -> List[np.ndarray]:
+        values = values.astype(np.int64) * mask
+        return [mask.sum(axis=-1), values.sum(axis=-1), (values * values).sum(axis=-1)]
+
+    flat_cards = codes.reshape(len(codes), codes.shape[1] * codes.shape[2])
+    per_card = np.stack(end_moments(totals, shot_ends) + end_moments(sixes, shot_sixes) + [
+        (flat_cards != EMPTY).sum(axis=-1),
+        np.count_nonzero(flat_cards == X, axis=-1),
+        np.count_nonzero(flat_cards == 10, axis=-1),
+        np.count_nonzero(flat_cards == 9, axis=-1),
+        np.ones(len(codes), dtype=np.int64),
+    ], axis=1).astype(np.int64)
+    moments = np.zeros((group_count, len(MOMENTS)), dtype=np.int64)
+    np.add.at(moments, groups, per_card)
+    return keys, score_histograms, ring_histograms, moments
+
+
+def _partition(archive: ScorecardArchive, chunk_cards: int) -> List[Tuple[int, int, int]]:
+    tasks = []
+    for arrows_per_end in ENDS_PER_SET:
+        count = len(archive.layout(arrows_per_end))
+        for start in range(0, count, chunk_cards):
+            tasks.append((arrows_per_end, start, min(count, start + chunk_cards)))
+    return tasks
+
+
+def compute_season_stats(archive_path: str, workers: Optional[int] = None, chunk_cards: Optional[int] = None,
+                         start_date=None, end_date=None, archer_id: Optional[int] = None) -> Dict[GroupKey, GroupStats]:
+    """Statistics per (archer_id, ruleset, arrows_per_end) over the whole archive."""
+    workers = workers or os.cpu_count() or 1
+    archive = ScorecardArchive(archive_path)
+    if chunk_cards is None:
+        # A few chunks per worker keeps the pool balanced without much merge work
+        chunk_cards = max(1, -(-len(archive) // (workers * 4)))
+    filters = (None if start_date is None else _to_days(start_date),
+               None if end_date is None else _to_days(end_date), archer_id)
+
+    blocks = {}
+    try:
+        for arrows_per_end in ENDS_PER_SET:
+            if len(archive.layout(arrows_per_end)):
+                blocks[arrows_per_end] = shared_memory.SharedMemory(
+                    create=True, size=3 * len(archive.layout(arrows_per_end)) * 8)
+                _slot_columns(archive, arrows_per_end, blocks[arrows_per_end].buf)
+        tasks = [task + (blocks[task[0]].name,) + filters for task in _partition(archive, chunk_cards)]
+
+        if workers == 1:
+            partials = [compute_partial(archive_path, *task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(compute_partial, archive_path, *task) for task in tasks]
+                partials = [future.result() for future in futures]
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    stats: Dict[GroupKey, GroupStats] = {}
+    for keys, score_histograms, ring_histograms, moments in partials:
+        for row, key in enumerate(map(tuple, keys.tolist())):
+            if key not in stats:
+                stats[key] = GroupStats(key[2])
+            stats[key].merge(score_histograms[row], ring_histograms[row], moments[row])
+    return dict(sorted(stats.items()))
+
+
+def display_season_stats(stats: Dict[GroupKey, GroupStats]):
+    """Print one line per group."""
+    print("\n" + "="*96)
+    print("SEASON STATISTICS")
+    print("="*96)
+    if not stats:
+        print("No scorecards found")
+        print("="*96)
+        return
+    print(f"{'Archer':>8} {'Ruleset':8} {'Arrows':>6} {'Cards':>6} {'Mean':>7} {'Best':>5} "
+          f"{'End μ':>6} {'End σ²':>7} {'Six σ²':>7} {'X%':>6} {'10%':>6} {'9%':>6}")
+    for (archer_id, ruleset, arrows_per_end), group in stats.items():
+        summary = group.summary()
+        print(f"{archer_id:>8} {RULESET_NAMES[ruleset]:8} {arrows_per_end:>6} {summary['cards']:>6} "
+              f"{summary['mean_score']:>7.1f} {summary['best_score']:>5} {summary['end_mean']:>6.2f} "
+              f"{summary['end_variance']:>7.2f} {summary['six_variance']:>7.2f} {summary['x_rate']:>6.1%} "
+              f"{summary['ten_rate']:>6.1%} {summary['nine_rate']:>6.1%}")
+    print("="*96)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Per-archer season statistics over a scorecard archive.")
+    parser.add_argument('archive', help="Scorecard archive (see scorecard_archive.py)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--from', dest='start_date', help="First event date (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='end_date', help="Last event date (YYYY-MM-DD)")
+    parser.add_argument('--archer', type=int, default=None, help="Only this archer id")
+    parser.add_argument('--json', action='store_true', help="Print the statistics as JSON")
+    args = parser.parse_args()
+
+    try:
+        stats = compute_season_stats(args.archive, args.workers, start_date=args.start_date,
+                                     end_date=args.end_date, archer_id=args.archer)
+    except (OSError, ValueError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps([{'archer_id': key[0], 'ruleset': RULESET_NAMES[key[1]], 'arrows_per_end': key[2],
+                           **group.summary()} for key, group in stats.items()], indent=2))
+    else:
+        display_season_stats(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Stale Identifier Scanner
+
+Finds leftover occurrences of old identifiers (package name, class name,
+Android namespace) anywhere in a Flutter project after a rename. A persistent
+trigram index of the project's text files is kept in .flutter_rename/ and
+updated incrementally from file mtimes and sizes, so repeat scans only read
+files that changed plus the few candidates the index cannot rule out.
+
+The index is a SQLite database. Each trigram maps to a packed, sorted array
+of file ids, and a query loads only the postings of its own trigrams. A
+changed file gets a new id and its old id is simply dropped from the file
+table; postings that still mention dead ids are filtered at query time and
+the index is rebuilt once dead ids outnumber live ones.
+
+Usage: python stale_scan.py IDENTIFIER [IDENTIFIER ...]
+"""
+
+import os
+import sys
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rename_lock import STATE_DIR_NAME
+
+
+INDEX_VERSION = 1
+
+# Directories holding generated or third-party output rather than project sources
+SKIPPED_DIRS = {'.git', '.dart_tool', '.gradle', '.idea', 'build', 'Pods', '.symlinks', 'ephemeral', STATE_DIR_NAME}
+
+# Binary files are detected by a NUL byte in their first block
+SNIFF_BYTES = 8192
+
+# Pending postings are merged into the database once they reach this many file ids
+FLUSH_POSTINGS = 2_000_000
+
+# Dead file ids tolerated in postings before the index is rebuilt
+MIN_DEAD_BEFORE_REBUILD = 1000
+
+# SQLite's default limit on host parameters per statement is 999
+QUERY_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    is_text INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    trigram BLOB PRIMARY KEY,
+    ids BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def extract_trigrams(data: bytes) -> Set[bytes]:
+    """Return the set of distinct 3-byte substrings of data."""
+    return {data[i:i + 3] for i in range(len(data) - 2)}
+
+
+def is_binary(data: bytes) -> bool:
+    """Sniff whether file content is binary."""
+    return b'\0' in data[:SNIFF_BYTES]
+
+
+def _unpacked(blob: bytes) -> array:
+    ids = array('I')
+    ids.frombytes(blob)
+    return ids
+
+
+class TrigramIndex:
+    def __init__(self, project_root: str = ".", index_path: Optional[str] = None):
+        self.project_root = Path(project_root).resolve()
+        self.index_path = Path(index_path) if index_path else self.project_root / STATE_DIR_NAME / "trigram_index.sqlite3"
+        self.connection: Optional[sqlite3.Connection] = None
+        # relative path -> (file id, mtime_ns, size, is_text)
+        self.files: Dict[str, Tuple[int, int, int, bool]] = {}
+        # trigram -> file ids added since the last flush
+        self.pending: Dict[bytes, array] = {}
+        self.pending_count = 0
+        self.reindexed_count = 0
+
+    def load(self) -> bool:
+        """Open the index and read its file table. Returns False if it was empty or outdated."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.index_path, timeout=30)
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_VERSION:
+            self.connection.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS postings;")
+            self.connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        self.connection.executescript(SCHEMA)
+        self.files = {
+            path: (file_id, mtime_ns, size, bool(is_text))
+            for file_id, path, mtime_ns, size, is_text
+            in self.connection.execute("SELECT id, path, mtime_ns, size, is_text FROM files")
+        }
+        return version == INDEX_VERSION and bool(self.files)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _walk(self) -> Iterable[Tuple[str, os.stat_result]]:
+        for dirpath, dirnames, filenames in os.walk(self.project_root):
+            dirnames[:] = [d for d in dirnames if d not in SKIPPED_DIRS]
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield os.path.relpath(path, self.project_root).replace(os.sep, '/'), stat
+
+    def _remove(self, relative_path: str):
+        # The id's postings become dead and are filtered out at query time
+        file_id = self.files.pop(relative_path)[0]
+        self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def _add(self, relative_path: str, stat: os.stat_result):
+        try:
+            with open(self.project_root / relative_path, 'rb') as f:
+                data = f.read(SNIFF_BYTES)
+                text = not is_binary(data)
+                if text:
+                    data += f.read()
+        except OSError:
+            return
+        file_id = self.connection.execute(
+            "INSERT INTO files (path, mtime_ns, size, is_text) VALUES (?, ?, ?, ?)",
+            (relative_path, stat.st_mtime_ns, stat.st_size, int(text))
+        ).lastrowid
+        self.files[relative_path] = (file_id, stat.st_mtime_ns, stat.st_size, text)
+        if not text:
+            return
+        trigrams = extract_trigrams(data)
+        for trigram in trigrams:
+            posting = self.pending.get(trigram)
+            if posting is None:
+                self.pending[trigram] = array('I', (file_id,))
+            else:
+                posting.append(file_id)
+        self.pending_count += len(trigrams)
+        if self.pending_count >= FLUSH_POSTINGS:
+            self._flush()
+
+    def _flush(self):
+        """Merge pending postings into the database; new ids are larger, so arrays stay sorted."""
+        trigrams = list(self.pending)
+        for start in range(0, len(trigrams), QUERY_CHUNK):
+            chunk = trigrams[start:start + QUERY_CHUNK]
+            existing = dict(self.connection.execute(
+                f"SELECT trigram, ids FROM postings WHERE trigram IN ({','.join('?' * len(chunk))})", chunk))
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO postings (trigram, ids) VALUES (?, ?)",
+                [(trigram, existing.get(trigram, b'') + self.pending[trigram].tobytes()) for trigram in chunk]
+            )
+        self.pending = {}
+        self.pending_count = 0
+
+    def _dead_count(self) -> int:
+        row = self.connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'files'").fetchone()
+        return (row[0] if row else 0) - len(self.files)
+
+    def update(self) -> bool:
+        """Bring the index up to date with the project. Returns True if anything changed."""
+        if self.connection is None:
+            self.load()
+        self.reindexed_count = 0
+        seen = set()
+        with self.connection:
+            for relative_path, stat in self._walk():
+                seen.add(relative_path)
+                entry = self.files.get(relative_path)
+                if entry and entry[1] == stat.st_mtime_ns and entry[2] == stat.st_size:
+                    continue
+                if entry:
+                    self._remove(relative_path)
+                self._add(relative_path, stat)
+                self.reindexed_count += 1
+
+            removed = [path for path in self.files if path not in seen]
+            for relative_path in removed:
+                self._remove(relative_path)
+            self._flush()
+
+        if self._dead_count() > max(MIN_DEAD_BEFORE_REBUILD, len(self.files)):
+            self.rebuild()
+        return bool(self.reindexed_count or removed)
+
+    def rebuild(self):
+        """Drop every posting and index the project from scratch."""
+        with self.connection:
+            self.connection.execute("DELETE FROM postings")
+            self.connection.execute("DELETE FROM files")
+            self.connection.execute("DELETE FROM sqlite_sequence WHERE name = 'files'")
+        self.files = {}
+        self.update()
+
+    def _text_ids(self) -> Dict[int, str]:
+        return {entry[0]: path for path, entry in self.files.items() if entry[3]}
+
+    def candidates(self, identifier: str, id_to_path: Optional[Dict[int, str]] = None) -> List[str]:
+        """Return text files that may contain identifier, according to the index."""
+        if self.connection is None:
+            self.load()
+        query = sorted(extract_trigrams(identifier.encode('utf-8')))
+        if id_to_path is None:
+            id_to_path = self._text_ids()
+        if not query:
+            return sorted(id_to_path.values())
+
+        postings = {}
+        for start in range(0, len(query), QUERY_CHUNK):
+            chunk = query[start:start + QUERY_CHUNK]
+            postings.update(self.connection.execute(
+                f"SELECT trigram, ids FROM postings WHERE trigram IN ({','.join('?' * len(chunk))})", chunk))
+        if len(postings) < len(query):
+            return []
+
+        matching: Optional[Set[int]] = None
+        for blob in sorted(postings.values(), key=len):
+            ids = _unpacked(blob)
+            matching = set(ids) if matching is None else matching.intersection(ids)
+            if not matching:
+                return []
+        return sorted(id_to_path[file_id] for file_id in matching if file_id in id_to_path)
+
+    def search(self, identifiers: List[str], ignore: Optional[Dict[str, List[str]]] = None) -> List[Tuple[str, str, int, str]]:
+        """Find every line containing one of identifiers.
+
+        ignore maps an identifier to longer strings that contain it (typically
+        the new identifiers) whose occurrences should not count as stale.
+        Returns (identifier, relative path, line number, line) tuples.
+        """
+        ignore = ignore or {}
+        id_to_path = self._text_ids()
+        results = []
+        for identifier in identifiers:
+            masks = [m for m in ignore.get(identifier, []) if identifier in m and m != identifier]
+            for relative_path in self.candidates(identifier, id_to_path):
+                try:
+                    with open(self.project_root / relative_path, 'r', encoding='utf-8', errors='replace') as f:
+                        lines = f.read().splitlines()
+                except OSError:
+                    continue
+                for line_number, line in enumerate(lines, 1):
+                    masked = line
+                    for mask in masks:
+                        masked = masked.replace(mask, '\0')
+                    if identifier in masked:
+                        results.append((identifier, relative_path, line_number, line.strip()))
+        return results
+
+
+def scan_project(project_root: str, identifiers: List[str],
+                 ignore: Optional[Dict[str, List[str]]] = None) -> List[Tuple[str, str, int, str]]:
+    """Update the persistent index for project_root and search it for identifiers."""
+    index = TrigramIndex(project_root)
+    try:
+        index.load()
+        index.update()
+        return index.search(identifiers, ignore)
+    finally:
+        index.close()
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    results = scan_project(".", sys.argv[1:])
+    for identifier, relative_path, line_number, line in results:
+        print(f"{relative_path}:{line_number}: [{identifier}] {line}")
+    sys.exit(1 if results else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test launcher icon brand pack generation and caching.
+"""
+
+from PIL import Image
+
+from brand_icons import BrandIconGenerator, read_ico_sizes, read_png_size
+from test_support import make_project_copy, remove_project_copy
+
+ICON_PATHS = [
+    "android/app/src/main/res",
+    "ios/Runner/Assets.xcassets/AppIcon.appiconset",
+    "macos/Runner/Assets.xcassets/AppIcon.appiconset",
+    "web/icons",
+    "web/manifest.json",
+    "web/favicon.png",
+    "windows/runner/resources/app_icon.ico",
+]
+
+
+def test_brand_icon_generation():
+    """Test that every icon is regenerated at its manifest size, and cached on re-run."""
+    print("Testing launcher icon generation...")
+
+    scratch = make_project_copy(*ICON_PATHS)
+    try:
+        source = scratch / "brand.png"
+        Image.new('RGBA', (1024, 1024), (200, 30, 30, 255)).save(source)
+
+        generator = BrandIconGenerator(str(scratch), max_workers=2)
+        targets = generator.collect_targets()
+        sizes = {t['path'].relative_to(scratch).as_posix(): t['size'] for t in targets}
+        assert sizes["android/app/src/main/res/mipmap-xxxhdpi/ic_launcher.png"] == 192
+        assert sizes["ios/Runner/Assets.xcassets/AppIcon.appiconset/Icon-App-83.5x83.5@2x.png"] == 167
+        assert sizes["macos/Runner/Assets.xcassets/AppIcon.appiconset/app_icon_1024.png"] == 1024
+        assert sizes["web/icons/Icon-maskable-512.png"] == 512
+        assert sizes["windows/runner/resources/app_icon.ico"] == (16, 32, 48, 256)
+
+        assert generator.generate(str(source))
+        assert generator.rendered_count > 0
+        for target in targets:
+            if target['format'] == 'ico':
+                assert read_ico_sizes(target['path']) == target['size']
+            else:
+                assert read_png_size(target['path']) == target['size']
+            with Image.open(target['path']) as icon:
+                if target['format'] != 'ico':
+                    assert icon.getpixel((0, 0))[:3] == (200, 30, 30)
+
+        generator = BrandIconGenerator(str(scratch))
+        assert generator.generate(str(source))
+        assert generator.rendered_count == 0
+        assert generator.cached_count == len(targets)
+        print("✓ Second run served entirely from cache")
+    finally:
+        remove_project_copy(scratch)
+
+
+if __name__ == "__main__":
+    test_brand_icon_generation()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test file locking and optimistic conflict detection for concurrent renames.
+"""
+
+import shutil
+import builtins
+import tempfile
+from pathlib import Path
+
+from flutter_rename import FlutterRenamer, main
+from rename_lock import RenameConflictError, RenameLocks
+from test_support import make_project_copy, release_scratch_history, remove_project_copy, use_scratch_history
+
+
+def test_file_locks():
+    """Test that overlapping lock sets conflict and disjoint ones do not."""
+    print("Testing rename file locks...")
+
+    scratch = Path(tempfile.mkdtemp())
+    try:
+        with RenameLocks(str(scratch), ["pubspec.yaml", "lib/main.dart"]):
+            with RenameLocks(str(scratch), ["ios/Runner/Info.plist"]):
+                pass
+
+            try:
+                with RenameLocks(str(scratch), ["lib/main.dart", "web/index.html"]):
+                    raise AssertionError("overlapping lock was granted")
+            except RenameConflictError as e:
+                print(f"✓ Conflict detected: {e}")
+
+            try:
+                with RenameLocks(str(scratch), exclusive_project=True, project_timeout=0.1):
+                    raise AssertionError("exclusive project lock was granted")
+            except RenameConflictError:
+                pass
+
+        # Everything is released once the outer lock set exits
+        with RenameLocks(str(scratch), ["lib/main.dart"], exclusive_project=True):
+            pass
+    finally:
+        shutil.rmtree(scratch)
+
+
+def test_modified_file_aborts_rename():
+    """Test that a file changed after detection aborts the rename before any write."""
+    scratch = make_project_copy()
+    try:
+        renamer = FlutterRenamer(str(scratch))
+        renamer.detect_current_configuration()
+
+        pubspec = scratch / "pubspec.yaml"
+        pubspec.write_text(pubspec.read_text(encoding='utf-8') + "\n# edited by another job\n", encoding='utf-8')
+
+        try:
+            renamer.verify_file_hashes()
+            raise AssertionError("modified file was not detected")
+        except RenameConflictError as e:
+            print(f"✓ Conflict detected: {e}")
+    finally:
+        remove_project_copy(scratch)
+
+
+def test_non_interactive_rename():
+    """Test a full non-interactive rename on a copy of this project."""
+    scratch = make_project_copy()
+    use_scratch_history(scratch)
+    try:
+        renamer = FlutterRenamer(str(scratch))
+        assert renamer.run_rename(package_name="brand_scorer", app_name="Brand Scorer", assume_yes=True, refresh=False)
+
+        assert "name: brand_scorer" in (scratch / "pubspec.yaml").read_text(encoding='utf-8')
+        assert "class BrandScorerApp extends" in (scratch / "lib" / "main.dart").read_text(encoding='utf-8')
+        assert (scratch / "android/app/src/main/kotlin/com/novoyuuparosk/brand_scorer/MainActivity.kt").exists()
+        print("✓ Non-interactive rename completed")
+    finally:
+        release_scratch_history()
+        remove_project_copy(scratch)
+
+
+def test_cli_exit_status():
+    """Test that the non-interactive CLI exits non-zero when it cannot finish."""
+    scratch = make_project_copy()
+    use_scratch_history(scratch)
+    original_input = builtins.input
+
+    def closed_stdin(prompt=""):
+        raise EOFError
+
+    builtins.input = closed_stdin
+    try:
+        for argv, expected in (
+            (['--project-root', str(scratch), '--package-name', 'brand_scorer'], 2),
+            (['--project-root', str(scratch), '--package-name', 'brand_scorer', '--app-name', 'Brand Scorer',
+              '--no-refresh'], 1),
+            (['--project-root', str(scratch), '--package-name', 'Bad Name', '--app-name', 'Brand Scorer', '--yes'], 1),
+        ):
+            try:
+                main(argv)
+                raise AssertionError(f"{argv} did not exit")
+            except SystemExit as e:
+                assert e.code == expected, (argv, e.code)
+        assert "name: brand_scorer" not in (scratch / "pubspec.yaml").read_text(encoding='utf-8')
+        print("✓ CLI failures exit non-zero")
+    finally:
+        builtins.input = original_input
+        release_scratch_history()
+        remove_project_copy(scratch)
+
+
+if __name__ == "__main__":
+    test_file_locks()
+    test_modified_file_aborts_rename()
+    test_non_interactive_rename()
+    test_cli_exit_status()
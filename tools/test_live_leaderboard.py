@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the incremental leaderboard against a full re-sort.
+"""
+
+import json
+import random
+
+from live_leaderboard import IndexableSkipList, Leaderboard, ingest, read_updates
+from test_scorecard_support import KEYPAD_VALUES, dart_counts, dart_end_total
+
+
+def test_skip_list_matches_sorted_list():
+    """Test insert, remove, index and positional lookup against a plain sorted list."""
+    rng = random.Random(34)
+    skip_list = IndexableSkipList(seed=1)
+    expected = []
+    for _ in range(2000):
+        if expected and rng.random() < 0.4:
+            key = rng.choice(expected)
+            expected.remove(key)
+            skip_list.remove(key)
+        else:
+            key = (rng.randint(-50, 0), rng.random())
+            expected.append(key)
+            skip_list.insert(key)
+        expected.sort()
+
+    assert len(skip_list) == len(expected)
+    assert list(skip_list) == expected
+    for position, key in enumerate(expected):
+        assert skip_list[position] == key
+        assert skip_list.index(key) == position
+    try:
+        skip_list.remove((1, 0.5))
+        raise AssertionError("missing key was removed")
+    except KeyError:
+        pass
+
+
+def test_leaderboard_matches_full_rebuild():
+    """Test a stream with corrections against rebuilding the ranking from scratch."""
+    print("Testing live leaderboard...")
+
+    rng = random.Random(35)
+    archers = [f"archer_{i:03d}" for i in range(60)]
+    lines = []
+    for _ in range(3000):
+        arrows = [rng.choice(KEYPAD_VALUES) for _ in range(rng.choice((3, 6)))]
+        lines.append(json.dumps({"archer": rng.choice(archers), "end": rng.randint(0, 9), "arrows": arrows}))
+    lines.insert(10, "not json")
+    bad_arrows = json.dumps({"archer": archers[0], "end": 0, "arrows": ["X", "11", "9"]})
+    lines.insert(20, bad_arrows)
+
+    leaderboard = Leaderboard(seed=2)
+    scorecards = {}
+    for (archer, rank), line in zip(ingest(read_updates(lines), leaderboard), (l for l in lines if l not in ("not json", bad_arrows))):
+        update = json.loads(line)
+        scorecards.setdefault(archer, {})[update['end']] = update['arrows']
+
+        rebuilt = []
+        for name, ends in scorecards.items():
+            card = list(ends.values())
+            x_count, ten_count, nine_count = dart_counts(card)
+            rebuilt.append((-sum(dart_end_total(end) for end in card), -x_count, -ten_count, -nine_count, name))
+        rebuilt.sort()
+        assert rank == rebuilt.index(next(key for key in rebuilt if key[4] == archer)) + 1
+
+    top = leaderboard.top(5)
+    assert [row['archer'] for row in top] == [key[4] for key in rebuilt[:5]]
+    assert [row['total'] for row in top] == [-key[0] for key in rebuilt[:5]]
+    assert leaderboard.rank(rebuilt[-1][4]) == len(rebuilt)
+    print(f"✓ {len(lines) - 1} updates ranked incrementally")
+
+
+if __name__ == "__main__":
+    test_skip_list_matches_sorted_list()
+    test_leaderboard_matches_full_rebuild()
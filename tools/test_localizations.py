@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test in-process ARB propagation and generated localization patching.
+"""
+
+import io
+from contextlib import redirect_stdout
+
+from flutter_rename import FlutterRenamer
+from test_support import make_project_copy, remove_project_copy
+
+LOCALIZATION_PATHS = ["l10n.yaml", "lib/config/localization"]
+
+
+def test_update_localizations():
+    """Test that appTitle is updated in every ARB and patched into the generated getters."""
+    print("Testing localization update...")
+
+    scratch = make_project_copy(*LOCALIZATION_PATHS)
+    try:
+        renamer = FlutterRenamer(str(scratch))
+        config = renamer.detect_current_configuration()
+        assert config['localized_title'] == config['generated_title'] == 'Archery Bookkeeper'
+
+        new_title = "Robin's $core"
+        assert renamer.update_localizations(new_title)
+
+        localization_dir = scratch / "lib" / "config" / "localization"
+        for arb_file in ("app_en.arb", "app_fi.arb"):
+            assert f'"appTitle": "{new_title}"' in (localization_dir / arb_file).read_text(encoding='utf-8')
+
+        generated_dir = localization_dir / "generated"
+        for dart_file in ("app_localizations_en.dart", "app_localizations_fi.dart"):
+            content = (generated_dir / dart_file).read_text(encoding='utf-8')
+            assert "String get appTitle => 'Robin\\'s \\$core';" in content
+            assert "String get appVersion => 'Alpha 0.1';" in content
+        assert "/// **'Robin\\'s \\$core'**" in (generated_dir / "app_localizations.dart").read_text(encoding='utf-8')
+        assert FlutterRenamer(str(scratch)).detect_current_configuration()['generated_title'] == new_title
+        print("✓ ARB files and generated getters updated")
+    finally:
+        remove_project_copy(scratch)
+
+
+def test_key_set_change_requires_regeneration():
+    """Test that a changed ARB key set is not patched in place."""
+    scratch = make_project_copy(*LOCALIZATION_PATHS)
+    try:
+        arb_path = scratch / "lib" / "config" / "localization" / "app_en.arb"
+        arb_path.write_text(arb_path.read_text(encoding='utf-8').replace('"appVersion"', '"appRelease"'), encoding='utf-8')
+
+        renamer = FlutterRenamer(str(scratch))
+        renamer.find_flutter_executable = lambda: None
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert not renamer.update_localizations("New Title")
+        assert "ARB keys differ from generated localizations" in output.getvalue()
+
+        generated = scratch / "lib" / "config" / "localization" / "generated" / "app_localizations_en.dart"
+        assert "String get appTitle => 'Archery Bookkeeper';" in generated.read_text(encoding='utf-8')
+        print("✓ Key set change falls back to regeneration")
+
+        # The ARBs already hold the new title, but the stale getter keeps the step planned
+        renamer = FlutterRenamer(str(scratch))
+        config = renamer.detect_current_configuration()
+        assert config['localized_title'] == "New Title"
+        assert config['generated_title'] == "Archery Bookkeeper"
+        assert 'localizations' in renamer.plan_updates("x", "New Title", "NewTitleApp", "com.example.x")
+    finally:
+        remove_project_copy(scratch)
+
+
+
+def test_missing_generated_file_names_the_cause():
+    """Test that a missing generated file is reported as such, not as an ARB key change."""
+    scratch = make_project_copy(*LOCALIZATION_PATHS)
+    try:
+        (scratch / "lib" / "config" / "localization" / "generated" / "app_localizations_fi.dart").unlink()
+
+        renamer = FlutterRenamer(str(scratch))
+        renamer.find_flutter_executable = lambda: None
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert not renamer.update_localizations("New Title")
+        assert "Generated localization file app_localizations_fi.dart not found, regenerating..." in output.getvalue()
+        assert "ARB keys differ" not in output.getvalue()
+    finally:
+        remove_project_copy(scratch)
+
+
+if __name__ == "__main__":
+    test_update_localizations()
+    test_key_set_change_requires_regeneration()
+    test_missing_generated_file_names_the_cause()
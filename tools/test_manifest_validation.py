@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test bulk manifest validation and collision detection.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from flutter_rename import FlutterRenamer, ManifestError, main
+
+
+def test_manifest_collisions():
+    """Test that duplicate package, class and Android IDs are reported per row."""
+    print("Testing manifest validation...")
+
+    renamer = FlutterRenamer()
+    renamer.current_config = {'android_namespace': 'com.example.archery_scorer'}
+
+    rows = [
+        {'package_name': 'my_app', 'app_name': 'My App!'},
+        {'package_name': 'other_app', 'app_name': 'My App'},
+        {'package_name': 'my_app', 'app_name': 'Third Variant'},
+        {'package_name': 'class', 'app_name': 'A'},
+        {'package_name': 'fourth_app', 'app_name': 'Fourth', 'android_package_id': 'com.example.other_app'},
+    ]
+    report = renamer.validate_manifest(rows)
+    renamer.display_manifest_report(report)
+
+    assert [entry['row'] for entry in report] == [1, 2, 3, 4, 5]
+    assert any("Duplicate class name 'MyApp'" in e for e in report[0]['errors'])
+    assert any("Duplicate class name 'MyApp'" in e for e in report[1]['errors'])
+    assert any("Duplicate package name 'my_app'" in e for e in report[2]['errors'])
+    assert any("Duplicate Android package ID 'com.example.other_app'" in e for e in report[4]['errors'])
+    assert len(report[3]['errors']) == 2  # reserved word + too short
+
+
+def test_manifest_large():
+    """Test that a large manifest of unique variants validates cleanly."""
+    renamer = FlutterRenamer()
+    rows = [{'package_name': f'variant_{i}', 'app_name': f'Variant {i}'} for i in range(20000)]
+    report = renamer.validate_manifest(rows)
+    assert all(not entry['errors'] for entry in report)
+    print(f"✓ {len(report)} unique rows validated")
+
+
+def test_manifest_load_errors():
+    """Test that unreadable or malformed manifests fail with exit status 1."""
+    scratch = Path(tempfile.mkdtemp())
+    try:
+        (scratch / "headers.csv").write_text("name,title\nmy_app,My App\n", encoding='utf-8')
+        (scratch / "ints.json").write_text("[1, 2]", encoding='utf-8')
+        (scratch / "partial.json").write_text('[{"package_name": "my_app"}]', encoding='utf-8')
+        (scratch / "broken.json").write_text('[{"package_name": ', encoding='utf-8')
+        (scratch / "object.json").write_text('{"apps": []}', encoding='utf-8')
+        (scratch / "good.csv").write_text("package_name,app_name\nmy_app,My App\n", encoding='utf-8')
+
+        renamer = FlutterRenamer()
+        for name in ("missing.csv", "headers.csv", "ints.json", "partial.json", "broken.json", "object.json"):
+            try:
+                renamer.load_manifest(str(scratch / name))
+                raise AssertionError(f"{name} was accepted")
+            except ManifestError as e:
+                print(f"✓ {name}: {e}")
+            try:
+                main(['validate-manifest', str(scratch / name)])
+                raise AssertionError("validate-manifest did not exit")
+            except SystemExit as e:
+                assert e.code == 1
+
+        # Values of the wrong type are per-row errors, not crashes
+        (scratch / "types.json").write_text(
+            '[{"package_name": 5, "app_name": "My App"}, {"package_name": "my_app", "app_name": "Second App",'
+            ' "android_package_id": ["com.example"]}, {"package_name": "other_app", "app_name": "Other App"}]',
+            encoding='utf-8')
+        report = renamer.validate_manifest(renamer.load_manifest(str(scratch / "types.json")))
+        assert report[0]['errors'][0] == "package_name must be a string, got int"
+        assert report[1]['errors'] == ["android_package_id must be a string, got list"]
+        assert report[2]['errors'] == []
+        try:
+            main(['validate-manifest', str(scratch / "types.json")])
+            raise AssertionError("validate-manifest did not exit")
+        except SystemExit as e:
+            assert e.code == 1
+
+        try:
+            main(['validate-manifest', str(scratch / "good.csv")])
+            raise AssertionError("validate-manifest did not exit")
+        except SystemExit as e:
+            assert e.code == 0
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    test_manifest_collisions()
+    test_manifest_large()
+    test_manifest_load_errors()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test the persistent rename run history and its report.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from flutter_rename import FlutterRenamer
+from rename_history import RunHistory, get_history, percentile
+from test_support import make_project_copy, release_scratch_history, remove_project_copy, use_scratch_history
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+    assert percentile(values, 0.5) == 5.0
+    assert percentile(values, 0.9) == 9.0
+    assert percentile(values, 0.99) == 10.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_run_history():
+    """Test that rename runs are recorded with per-step timings and reported."""
+    print("Testing rename run history...")
+
+    project = make_project_copy()
+    history_path = use_scratch_history(project)
+    try:
+        renamer = FlutterRenamer(str(project))
+        assert renamer.run_rename(package_name="history_app", app_name="History App", assume_yes=True, refresh=False)
+        assert renamer.run_rename(package_name="history_app", app_name="History App", assume_yes=True, refresh=False)
+
+        # Records stay buffered until flushed
+        assert not history_path.exists()
+        get_history().flush()
+
+        runs = RunHistory(str(history_path)).load_runs(project=str(project))
+        assert len(runs) == 2
+        first = runs[0]
+        assert first['success'] and first['parameters']['package_name'] == "history_app"
+        step_names = [step['name'] for step in first['steps']]
+        assert step_names[0] == 'detect' and 'pubspec' in step_names and 'stale_scan' in step_names
+        assert first['bytes_read'] > 0 and first['bytes_written'] > 0
+        assert [step['name'] for step in runs[1]['steps']] == ['detect']  # nothing left to change
+
+        get_history().display_report(project=str(project))
+    finally:
+        release_scratch_history()
+        remove_project_copy(project)
+
+
+def test_unwritable_history_is_a_warning():
+    """Test that a history directory that cannot be created does not fail the caller."""
+    scratch = Path(tempfile.mkdtemp())
+    try:
+        # A file where the history directory should be makes mkdir raise OSError
+        (scratch / "not_a_directory").write_text("", encoding='utf-8')
+        history = RunHistory(str(scratch / "not_a_directory" / "history.sqlite3"), batch_size=1)
+        history.add({'started_at': 0.0, 'project': str(scratch), 'parameters': {}, 'success': True,
+                     'duration': 0.0, 'flutter_seconds': 0.0, 'bytes_read': 0, 'bytes_written': 0, 'steps': []})
+        assert history.pending == []
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    test_percentile()
+    test_run_history()
+    test_unwritable_history_is_a_warning()
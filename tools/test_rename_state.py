@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test incremental re-renames driven by the rename state snapshot.
+"""
+
+import os
+import json
+
+from flutter_rename import ANDROID_GRADLE_PATH, MAIN_DART_PATH, PUBSPEC_PATH, FlutterRenamer
+from test_support import make_project_copy, release_scratch_history, remove_project_copy, use_scratch_history
+
+
+def test_snapshot_drives_repeat_renames():
+    """Test that unchanged files are trusted and only the needed steps run."""
+    print("Testing rename state snapshot...")
+
+    scratch = make_project_copy()
+    use_scratch_history(scratch)
+    try:
+        original = FlutterRenamer(str(scratch)).detect_current_configuration()
+        renamer = FlutterRenamer(str(scratch))
+        assert renamer.run_rename(package_name="brand_scorer", app_name="Brand Scorer", assume_yes=True, refresh=False)
+
+        state = json.loads((scratch / ".flutter_rename" / "state.json").read_text(encoding='utf-8'))
+        assert state['identifiers']['package_name'] == "brand_scorer"
+        assert state['files'][PUBSPEC_PATH]['config']['package_name'] == "brand_scorer"
+
+        # Nothing changed: every configuration file comes from the snapshot, none is read
+        renamer = FlutterRenamer(str(scratch))
+        config = renamer.detect_current_configuration()
+        assert renamer.trusted_files == set(path for path, _ in renamer.config_sources())
+        assert renamer.bytes_read == 0
+        assert config['main_class'] == "BrandScorerApp"
+        assert config == FlutterRenamer(str(scratch)).detect_current_configuration(use_state=False)
+        print(f"✓ {len(renamer.trusted_files)} files trusted without reading")
+
+        # An edited file is parsed again; the rest stay trusted
+        main_dart = scratch / "lib" / "main.dart"
+        main_dart.write_text(main_dart.read_text(encoding='utf-8').replace("BrandScorerApp", "HandEditedApp"),
+                             encoding='utf-8')
+        renamer = FlutterRenamer(str(scratch))
+        config = renamer.detect_current_configuration()
+        assert MAIN_DART_PATH not in renamer.trusted_files and ANDROID_GRADLE_PATH in renamer.trusted_files
+        assert config['main_class'] == "HandEditedApp"
+
+        # Same package, new display name: the Android namespace steps are skipped
+        plan = renamer.plan_updates("brand_scorer", "Brand Scorer", "BrandScorerApp",
+                                    renamer.generate_android_package_id("brand_scorer"))
+        assert plan == ['main_dart', 'test_files']
+        assert renamer.run_rename(package_name="brand_scorer", app_name="Brand Scorer Pro", assume_yes=True, refresh=False)
+        assert 'android_gradle' not in [step['name'] for step in renamer.step_timings]
+        assert "class BrandScorerProApp extends" in main_dart.read_text(encoding='utf-8')
+        # The test file still named the snapshot's class, not the hand-edited one
+        widget_test = (scratch / "test" / "widget_test.dart").read_text(encoding='utf-8')
+        assert "const BrandScorerProApp()" in widget_test and "BrandScorerApp" not in widget_test
+
+        # Reverting goes back to the original identifiers, keeping the Android domain
+        renamer = FlutterRenamer(str(scratch))
+        assert renamer.run_rename(package_name=original['package_name'], app_name=original['app_title'],
+                                  assume_yes=True, refresh=False)
+        reverted = FlutterRenamer(str(scratch)).detect_current_configuration(use_state=False)
+        assert reverted['android_namespace'] == original['android_namespace']
+        assert reverted['main_class'] == original['main_class']
+        print("✓ Repeat rename and revert applied only the needed steps")
+    finally:
+        release_scratch_history()
+        remove_project_copy(scratch)
+
+
+
+def test_change_after_read_is_not_trusted():
+    """Test that a file changed by another job after it was read is parsed again next time."""
+    scratch = make_project_copy()
+    try:
+        renamer = FlutterRenamer(str(scratch))
+        config = renamer.detect_current_configuration()
+
+        # Another job rewrites pubspec.yaml (same size) before this one saves its snapshot
+        pubspec = scratch / PUBSPEC_PATH
+        content = pubspec.read_text(encoding='utf-8')
+        other_name = config['package_name'][:-1] + ('x' if config['package_name'][-1] != 'x' else 'y')
+        pubspec.write_text(content.replace(f"name: {config['package_name']}", f"name: {other_name}"), encoding='utf-8')
+        stat = pubspec.stat()
+        os.utime(pubspec, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))  # coarse-mtime filesystems
+        renamer.save_state({'package_name': config['package_name']})
+
+        renamer = FlutterRenamer(str(scratch))
+        assert renamer.detect_current_configuration()['package_name'] == other_name
+        assert PUBSPEC_PATH not in renamer.trusted_files
+    finally:
+        remove_project_copy(scratch)
+
+
+if __name__ == "__main__":
+    test_snapshot_drives_repeat_renames()
+    test_change_after_read_is_not_trusted()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the memory-mapped scorecard archive.
+"""
+
+import json
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from scorecard_archive import INDOOR, OUTDOOR, ScorecardArchive, ScorecardArchiveWriter, pack_json_lines
+from scorecard_engine import decode_batch, encode_batch, score_batch
+from test_scorecard_support import random_card
+
+
+def test_archive_round_trip():
+    """Test that cards, index records and scores survive a write/read cycle."""
+    print("Testing scorecard archive round trip...")
+
+    rng = random.Random(33)
+    scratch = Path(tempfile.mkdtemp())
+    try:
+        cards = {3: [random_card(rng, 3) for _ in range(50)], 6: [random_card(rng, 6) for _ in range(40)]}
+        path = scratch / "season.abka"
+        with ScorecardArchiveWriter(str(path)) as writer:
+            writer.add_codes(encode_batch(cards[3], 3), 3, archer_ids=np.arange(50) % 7, event_dates="2026-01-10")
+            for i, card in enumerate(cards[6]):
+                writer.add(card, 6, archer_id=i % 5, event_date="2026-05-%02d" % (i % 28 + 1))
+            writer.add(cards[3][0], 3, archer_id=99, event_date="2026-02-01", ruleset="outdoor")
+
+        archive = ScorecardArchive(str(path))
+        assert len(archive) == 91
+        assert archive.cards3.shape == (51, 10, 3) and archive.cards6.shape == (40, 6, 6)
+        assert isinstance(archive.cards3, np.memmap) and archive.cards3.dtype == np.int8
+        assert decode_batch(archive.cards3[:50]) == cards[3]
+        assert decode_batch(archive.cards6) == cards[6]
+
+        # Index records point back at the right blocks
+        assert archive.index['ruleset'][:50].tolist() == [INDOOR] * 50
+        assert archive.index['ruleset'][50:90].tolist() == [OUTDOOR] * 40
+        assert archive.index['ruleset'][90] == OUTDOOR
+        assert decode_batch(archive.card(60)[np.newaxis])[0] == cards[6][10]
+
+        slots = archive.select(6, archer_id=2, start_date="2026-05-10")
+        expected = [i for i in range(40) if i % 5 == 2 and i % 28 + 1 >= 10]
+        assert slots.tolist() == expected
+        assert archive.select(3, ruleset=OUTDOOR).tolist() == [50]
+
+        # Scoring works directly on the mapped views
+        scores = score_batch(archive.cards6, 6)
+        assert scores['final_score'].tolist() == score_batch(encode_batch(cards[6], 6), 6)['final_score'].tolist()
+        print(f"✓ {len(archive)} cards round-tripped ({path.stat().st_size} bytes)")
+        del archive, scores
+    finally:
+        shutil.rmtree(scratch)
+
+
+def test_pack_json_lines():
+    """Test packing a JSON-lines export and reading an empty layout."""
+    scratch = Path(tempfile.mkdtemp())
+    try:
+        source = scratch / "cards.jsonl"
+        source.write_text(json.dumps({"archer_id": 4, "date": "2026-03-01", "arrows_per_end": 3,
+                                      "scores": [["X", "9", "M"]]}) + "\n\n", encoding='utf-8')
+        assert pack_json_lines(str(source), str(scratch / "cards.abka")) == 1
+
+        archive = ScorecardArchive(str(scratch / "cards.abka"))
+        assert archive.cards6.shape == (0, 6, 6)
+        assert decode_batch(archive.cards3)[0][0] == ['X', '9', 'M']
+        assert archive.index['event_date'][0] == np.datetime64('2026-03-01').astype(int)
+        del archive
+
+        bad = scratch / "bad.jsonl"
+        bad.write_text(source.read_text(encoding='utf-8') + json.dumps(
+            {"archer_id": 5, "arrows_per_end": 3, "scores": [["X", "11", "9"]]}) + "\n", encoding='utf-8')
+        try:
+            pack_json_lines(str(bad), str(scratch / "bad.abka"))
+            raise AssertionError("non-keypad cell was packed")
+        except ValueError as e:
+            assert str(e).startswith("Line 3:")
+        assert not (scratch / "bad.abka").exists()
+
+        try:
+            ScorecardArchive(str(source))
+            raise AssertionError("non-archive file was accepted")
+        except ValueError:
+            pass
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    test_archive_round_trip()
+    test_pack_json_lines()
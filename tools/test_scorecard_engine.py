@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized scorecard engine against the ScoringGrid rules.
+"""
+
+import random
+
+from scorecard_engine import ENDS_PER_SET, decode_batch, encode_batch, encode_score, score_batch
+from test_scorecard_support import (dart_accumulative, dart_counts, dart_end_total, dart_sum_of_six,
+                                   dart_sum_of_three, random_card)
+
+def test_engine_matches_dart():
+    """Test every figure of random batches against the Dart rules."""
+    print("Testing scorecard engine parity...")
+
+    rng = random.Random(32)
+    for arrows_per_end in (3, 6):
+        cards = [random_card(rng, arrows_per_end) for _ in range(300)]
+        cards.append([[''] * arrows_per_end for _ in range(ENDS_PER_SET[arrows_per_end])])
+        codes = encode_batch(cards, arrows_per_end)
+        assert decode_batch(codes) == cards
+
+        results = score_batch(codes, arrows_per_end)
+        for card_index, scores in enumerate(cards):
+            for end in range(len(scores)):
+                assert results['end_totals'][card_index, end] == dart_end_total(scores[end])
+                assert results['sum_of_three'][card_index, end] == dart_sum_of_three(scores, end)
+                assert results['sum_of_six'][card_index, end] == dart_sum_of_six(scores, end, arrows_per_end)
+                assert results['running_totals'][card_index, end] == dart_accumulative(scores, end)
+            assert results['final_score'][card_index] == dart_accumulative(scores, len(scores) - 1)
+            x_count, ten_count, nine_count = dart_counts(scores)
+            assert (results['x_count'][card_index], results['ten_count'][card_index],
+                    results['nine_count'][card_index]) == (x_count, ten_count, nine_count)
+        print(f"✓ {len(cards)} {arrows_per_end}-arrow cards match")
+
+
+def test_ragged_cards_are_padded():
+    """Test that short cards are padded with empty cells."""
+    codes = encode_batch([[['X', '9']], []], 3)
+    assert codes.shape == (2, 10, 3)
+    assert decode_batch(codes)[0][0] == ['X', '9', '']
+    assert score_batch(codes, 3)['final_score'].tolist() == [19, 0]
+
+
+def test_non_keypad_cells_are_rejected():
+    """Test that cells the keypad cannot produce raise instead of encoding lossily."""
+    for score in ('11', ' 9', 'x', '-1', None, 10):
+        try:
+            encode_score(score)
+            raise AssertionError(f"{score!r} was encoded")
+        except ValueError:
+            pass
+    try:
+        encode_batch([[['X', '11', '9']]], 3)
+        raise AssertionError("card with '11' was encoded")
+    except ValueError:
+        pass
+    assert decode_batch(encode_batch([[['0', 'M', '']]], 3))[0][0] == ['0', 'M', '']
+
+
+if __name__ == "__main__":
+    test_engine_matches_dart()
+    test_ragged_cards_are_padded()
+    test_non_keypad_cells_are_rejected()
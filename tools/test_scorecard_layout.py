@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test batched layout conversion and end sorting against the ScoringPage rules.
+"""
+
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from scorecard_archive import INDOOR, OUTDOOR, ScorecardArchive, ScorecardArchiveWriter, convert_archive
+from scorecard_engine import ENDS_PER_SET, convert_layout, decode_batch, encode_batch, sort_ends
+from test_scorecard_support import random_card
+
+
+# Straight transcriptions of ScoringPage's Dart methods
+
+def dart_sort_end_scores(end):
+    def get_score_value(score):
+        if score == 'X':
+            return 11
+        if score == 'M':
+            return -1
+        return int(score) if score.isdigit() else 0
+
+    non_empty = sorted((score for score in end if score), key=get_score_value, reverse=True)
+    return non_empty + [score for score in end if not score]
+
+
+def dart_preserve_scores(old_scores, old_arrows_per_end, arrows_per_end):
+    scores = [[''] * arrows_per_end for _ in range(ENDS_PER_SET[arrows_per_end])]
+
+    all_old_scores = []
+    for visual_row in range(12):
+        if old_arrows_per_end == 3:
+            if visual_row < len(old_scores):
+                for col in range(min(3, len(old_scores[visual_row]))):
+                    all_old_scores.append(old_scores[visual_row][col])
+        else:
+            logical_end, row_in_end = divmod(visual_row, 2)
+            if logical_end < len(old_scores):
+                for col in range(3):
+                    arrow_index = row_in_end * 3 + col
+                    if arrow_index < len(old_scores[logical_end]):
+                        all_old_scores.append(old_scores[logical_end][arrow_index])
+
+    score_index = 0
+    for visual_row in range(12):
+        if arrows_per_end == 3:
+            if visual_row < len(scores):
+                for col in range(3):
+                    if score_index < len(all_old_scores) and all_old_scores[score_index]:
+                        scores[visual_row][col] = all_old_scores[score_index]
+                    score_index += 1
+                scores[visual_row] = dart_sort_end_scores(scores[visual_row])
+        else:
+            logical_end, row_in_end = divmod(visual_row, 2)
+            if logical_end < len(scores):
+                for col in range(3):
+                    arrow_index = row_in_end * 3 + col
+                    if arrow_index < arrows_per_end and score_index < len(all_old_scores) and all_old_scores[score_index]:
+                        scores[logical_end][arrow_index] = all_old_scores[score_index]
+                    score_index += 1
+                if row_in_end == 1:
+                    scores[logical_end] = dart_sort_end_scores(scores[logical_end])
+    return scores
+
+
+def test_sort_ends_matches_dart():
+    """Test that batched sorting matches _sortEndScores end by end."""
+    rng = random.Random(35)
+    for arrows_per_end in (3, 6):
+        cards = [random_card(rng, arrows_per_end) for _ in range(200)]
+        sorted_cards = decode_batch(sort_ends(encode_batch(cards, arrows_per_end)))
+        assert sorted_cards == [[dart_sort_end_scores(end) for end in card] for card in cards]
+
+
+def test_convert_layout_matches_dart():
+    """Test every direction of layout conversion against _preserveScoresWithNewArrowCount."""
+    print("Testing layout conversion parity...")
+
+    rng = random.Random(36)
+    for old_arrows in (3, 6):
+        cards = [random_card(rng, old_arrows) for _ in range(300)]
+        # Partly filled cards, as left by an unfinished round
+        for card in cards[:50]:
+            for end in card[rng.randint(0, len(card)):]:
+                end[:] = [''] * old_arrows
+        codes = encode_batch(cards, old_arrows)
+
+        for new_arrows in (3, 6):
+            converted = convert_layout(codes, old_arrows, new_arrows)
+            assert converted.shape == (len(cards), ENDS_PER_SET[new_arrows], new_arrows)
+            assert decode_batch(converted) == [dart_preserve_scores(card, old_arrows, new_arrows) for card in cards]
+            print(f"✓ {len(cards)} cards converted {old_arrows} → {new_arrows} arrows")
+
+
+def test_convert_archive():
+    """Test converting a whole archive to one layout."""
+    rng = random.Random(37)
+    scratch = Path(tempfile.mkdtemp())
+    try:
+        cards = {3: [random_card(rng, 3) for _ in range(20)], 6: [random_card(rng, 6) for _ in range(15)]}
+        with ScorecardArchiveWriter(str(scratch / "source.abka")) as writer:
+            writer.add_codes(encode_batch(cards[6], 6), 6, archer_ids=np.arange(15), event_dates="2026-06-01")
+            writer.add_codes(encode_batch(cards[3], 3), 3, archer_ids=np.arange(20) + 100, event_dates="2026-01-01")
+
+        assert convert_archive(str(scratch / "source.abka"), str(scratch / "outdoor.abka"), 6) == 35
+        archive = ScorecardArchive(str(scratch / "outdoor.abka"))
+        assert archive.cards3.shape == (0, 10, 3) and archive.cards6.shape == (35, 6, 6)
+        assert archive.index['ruleset'].tolist() == [OUTDOOR] * 35
+        assert archive.index['archer_id'].tolist() == list(range(15)) + list(range(100, 120))
+        assert decode_batch(archive.card(20)[np.newaxis])[0] == dart_preserve_scores(cards[3][5], 3, 6)
+        assert decode_batch(archive.card(3)[np.newaxis])[0] == [dart_sort_end_scores(end) for end in cards[6][3]]
+        del archive
+
+        # Without a target layout, cards stay where they are and are only re-sorted
+        convert_archive(str(scratch / "source.abka"), str(scratch / "sorted.abka"))
+        archive = ScorecardArchive(str(scratch / "sorted.abka"))
+        assert archive.index['ruleset'].tolist() == [OUTDOOR] * 15 + [INDOOR] * 20
+        assert decode_batch(archive.cards3) == [[dart_sort_end_scores(end) for end in card] for card in cards[3]]
+        del archive
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    test_sort_ends_matches_dart()
+    test_convert_layout_matches_dart()
+    test_convert_archive()
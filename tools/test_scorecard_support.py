@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the scorecard tests: random keypad scorecards and
+reference transcriptions of ScoringGrid's per-cell Dart methods.
+"""
+
+from scorecard_engine import ENDS_PER_SET
+
+KEYPAD_VALUES = ['X', '10', '9', '8', '7', '6', '5', '4', '3', '2', '1', 'M', '']
+
+
+# Straight transcriptions of ScoringGrid's per-cell Dart methods
+
+def dart_end_total(end):
+    total = 0
+    for score in end:
+        if score == 'X':
+            total += 10
+        elif score == 'M' or score == '':
+            total += 0
+        else:
+            total += int(score) if score.isdigit() else 0
+    return total
+
+
+def dart_sum_of_three(scores, logical_end):
+    return dart_end_total(scores[logical_end][:3])
+
+
+def dart_sum_of_six(scores, logical_end, arrows_per_end):
+    if arrows_per_end == 6:
+        return dart_end_total(scores[logical_end])
+    if logical_end % 2 == 1 and logical_end > 0:
+        return dart_end_total(scores[logical_end - 1]) + dart_end_total(scores[logical_end])
+    return 0
+
+
+def dart_accumulative(scores, end_index):
+    return sum(dart_end_total(scores[i]) for i in range(min(end_index + 1, len(scores))))
+
+
+def dart_counts(scores):
+    flat = [score for end in scores for score in end]
+    return flat.count('X'), flat.count('10'), flat.count('9')
+
+
+def random_card(rng, arrows_per_end):
+    return [[rng.choice(KEYPAD_VALUES) for _ in range(arrows_per_end)] for _ in range(ENDS_PER_SET[arrows_per_end])]
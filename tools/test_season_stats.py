@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the season statistics engine against a plain Python pass over the cards.
+"""
+
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from scorecard_archive import ScorecardArchiveWriter
+from season_stats import compute_season_stats
+from test_scorecard_support import dart_counts, dart_end_total, dart_sum_of_six, random_card
+
+
+def reference_stats(cards):
+    """Per-group figures computed one card at a time with the Dart rules."""
+    groups = {}
+    for archer_id, ruleset, arrows_per_end, date, scores in cards:
+        group = groups.setdefault((archer_id, ruleset, arrows_per_end), {
+            'cards': 0, 'scores': {}, 'rings': {}, 'ends': [], 'sixes': [], 'arrows': 0, 'counts': [0, 0, 0]})
+        group['cards'] += 1
+        final = sum(dart_end_total(end) for end in scores)
+        group['scores'][final] = group['scores'].get(final, 0) + 1
+        for end_index, end in enumerate(scores):
+            for score in end:
+                if score:
+                    group['rings'][score] = group['rings'].get(score, 0) + 1
+                    group['arrows'] += 1
+            if any(end):
+                group['ends'].append(dart_end_total(end))
+            shot_six = any(end) if arrows_per_end == 6 else end_index % 2 == 1 and (any(end) or any(scores[end_index - 1]))
+            if shot_six:
+                group['sixes'].append(dart_sum_of_six(scores, end_index, arrows_per_end))
+        group['counts'] = [a + b for a, b in zip(group['counts'], dart_counts(scores))]
+    return groups
+
+
+def test_season_stats_match_reference():
+    """Test serial and parallel runs against the reference, with exact merging."""
+    print("Testing season statistics...")
+
+    rng = random.Random(36)
+    scratch = Path(tempfile.mkdtemp())
+    try:
+        cards = []
+        for _ in range(400):
+            arrows_per_end = rng.choice((3, 6))
+            ruleset = rng.choice(('indoor', 'outdoor'))
+            cards.append((rng.randint(1, 8), 0 if ruleset == 'indoor' else 1, arrows_per_end,
+                          f"2026-{rng.randint(1, 12):02d}-01", random_card(rng, arrows_per_end)))
+        path = str(scratch / "season.abka")
+        with ScorecardArchiveWriter(path) as writer:
+            for archer_id, ruleset, arrows_per_end, date, scores in cards:
+                writer.add(scores, arrows_per_end, archer_id, date, ruleset)
+
+        serial = compute_season_stats(path, workers=1, chunk_cards=1000)
+        parallel = compute_season_stats(path, workers=3, chunk_cards=17)
+        assert list(serial) == list(parallel)
+        for key in serial:
+            assert np.array_equal(serial[key].moments, parallel[key].moments)
+            assert np.array_equal(serial[key].score_histogram, parallel[key].score_histogram)
+            assert np.array_equal(serial[key].ring_histogram, parallel[key].ring_histogram)
+
+        expected = reference_stats(cards)
+        assert set(serial) == set(expected)
+        for key, group in serial.items():
+            summary, reference = group.summary(), expected[key]
+            assert summary['cards'] == reference['cards']
+            assert summary['score_histogram'] == reference['scores']
+            assert {ring: count for ring, count in summary['ring_histogram'].items() if count} == reference['rings']
+            assert np.isclose(summary['end_mean'], np.mean(reference['ends']))
+            assert np.isclose(summary['end_variance'], np.var(reference['ends']))
+            assert np.isclose(summary['six_variance'], np.var(reference['sixes']))
+            x_count, ten_count, nine_count = reference['counts']
+            assert np.isclose(summary['x_rate'], x_count / reference['arrows'])
+            assert np.isclose(summary['nine_rate'], nine_count / reference['arrows'])
+        print(f"✓ {len(serial)} groups match across serial and parallel runs")
+
+        summer = compute_season_stats(path, workers=1, start_date="2026-06-01", end_date="2026-08-31", archer_id=3)
+        assert sum(group['cards'] for group in summer.values()) == sum(
+            1 for card in cards if card[0] == 3 and "2026-06" <= card[3][:7] <= "2026-08")
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    test_season_stats_match_reference()
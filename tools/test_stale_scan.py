@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test the trigram-indexed stale identifier scan.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from stale_scan import TrigramIndex, scan_project
+
+
+def test_stale_scan():
+    """Test indexing, incremental updates, binary skipping and new-name masking."""
+    print("Testing stale identifier scan...")
+
+    scratch = Path(tempfile.mkdtemp())
+    try:
+        (scratch / "lib").mkdir()
+        (scratch / "lib" / "main.dart").write_text("import 'package:old_app/home.dart';\nvoid main() {}\n")
+        (scratch / "linux").mkdir()
+        (scratch / "linux" / "CMakeLists.txt").write_text('set(BINARY_NAME "old_app")\n')
+        (scratch / "web").mkdir()
+        (scratch / "web" / "index.html").write_text("<title>old_app_pro</title>\n")
+        (scratch / "assets").mkdir()
+        (scratch / "assets" / "logo.png").write_bytes(b"\x89PNG\0\0old_app\0")
+        (scratch / "build").mkdir()
+        (scratch / "build" / "out.txt").write_text("old_app\n")
+
+        results = scan_project(str(scratch), ['old_app'], {'old_app': ['old_app_pro']})
+        assert [(r[1], r[2]) for r in results] == [("lib/main.dart", 1), ("linux/CMakeLists.txt", 1)]
+
+        index = TrigramIndex(str(scratch))
+        assert index.load()
+        assert not index.update()
+        assert index.reindexed_count == 0
+
+        cmake = scratch / "linux" / "CMakeLists.txt"
+        cmake.write_text('set(BINARY_NAME "new_app")\n')
+        stat = cmake.stat()
+        os.utime(cmake, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert index.update()
+        assert index.reindexed_count == 1
+        assert index.candidates('old_app') == ["lib/main.dart", "web/index.html"]
+        assert index.candidates('never_seen_anywhere') == []
+
+        # The changed file's old id is dead until the index is rebuilt
+        assert index._dead_count() == 1
+        index.rebuild()
+        assert index._dead_count() == 0
+        assert index.candidates('old_app') == ["lib/main.dart", "web/index.html"]
+        index.close()
+        print("✓ Index updated incrementally and binary files skipped")
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    test_stale_scan()
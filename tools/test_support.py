@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the renamer tests: scratch copies of this Flutter project
+and an isolated run history.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from rename_history import HISTORY_ENV_VAR, get_history
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_project_copy(*relative_paths: str) -> Path:
+    """Copy this project, or only the given paths, into <scratch>/project.
+
+    A full copy leaves out git data, tool state and build output.
+    """
+    project = Path(tempfile.mkdtemp()) / "project"
+    if not relative_paths:
+        shutil.copytree(PROJECT_ROOT, project,
+                        ignore=shutil.ignore_patterns('.git', '.flutter_rename', 'build', '__pycache__'))
+        return project
+    for relative in relative_paths:
+        source = PROJECT_ROOT / relative
+        destination = project / relative
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if source.is_dir():
+            shutil.copytree(source, destination)
+        else:
+            shutil.copy(source, destination)
+    return project
+
+
+def remove_project_copy(project: Path):
+    """Delete a copy made by make_project_copy, with anything else in its scratch directory."""
+    shutil.rmtree(project.parent)
+
+
+def use_scratch_history(project: Path) -> Path:
+    """Point the rename run history at a database next to a project copy."""
+    history_path = project.parent / "history.sqlite3"
+    os.environ[HISTORY_ENV_VAR] = str(history_path)
+    return history_path
+
+
+def release_scratch_history():
+    """Flush buffered runs and stop using the scratch history."""
+    get_history().flush()
+    del os.environ[HISTORY_ENV_VAR]